@@ -0,0 +1,240 @@
+"""Benchmarks for the dashboard's data paths.
+
+Run with:  python benchmark.py [--matches N]
+"""
+import argparse
+import copy
+import io
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from elo import new_elo, replay_elo, update_elo
+from feature_store import append_matches, new_feature_store
+from ingest import apply_matches_batch, apply_matches_sequential, ingest_paste, new_team_stats
+from match_store import ColumnarMatchData, empty_columns, match_columns
+from outcome_model import new_outcome_model, predict_fixtures_with_model, predict_with_model, update_model
+from ranking_history import new_ranking_history
+from rolling_metrics import new_rolling_metrics
+from season_summaries import new_season_summaries
+from snapshot import ROLLING_ARRAYS, load_snapshot, save_snapshot
+from team_names import TEAM_ALIASES, build_team_index, resolve_team
+from value_bets import MARKETS, value_bet_board
+from views import league_table, recent_feed_html
+
+TEAMS = [
+    "Leeds", "Aston V", "Manchester Blue", "Liverpool", "London Blues", "Everton",
+    "Brighton", "Sheffield U", "Tottenham", "Palace", "Newcastle", "West Ham",
+    "Leicester", "West Brom", "Burnley", "London Reds", "Southampton", "Wolves",
+    "Fulham", "Manchester Reds"
+]
+INGEST_BUDGET = 1.0  # seconds per 100k-matches paste (and any smaller one), every per-paste update included
+
+
+def make_state(teams=TEAMS):
+    """Fresh dashboard state, shaped like st.session_state"""
+    return {
+        "team_stats": new_team_stats(teams),
+        "home_counters": {team: 0 for team in teams},
+        "away_counters": {team: 0 for team in teams},
+        "ha_counters": {team: 0 for team in teams},
+        "status3_counters": {team: 0 for team in teams},
+        "match_counter": 1,
+        "season_number": 1,
+    }
+
+
+def make_dashboard_state(teams=TEAMS):
+    """make_state plus everything a paste feeds: match_data, ranking timeline, summaries, rolling metrics, Elo"""
+    state = make_state(teams)
+    state["match_data"] = ColumnarMatchData(empty_columns(), teams)
+    state["ranking_history"] = new_ranking_history(state["team_stats"])
+    state["season_summaries"] = new_season_summaries()
+    state["rolling_metrics"] = new_rolling_metrics(teams)
+    state["elo"] = new_elo(teams)
+    return state
+
+
+def make_matches(n, seed=0, teams=TEAMS):
+    """Random parsed matches in the [home, home_score, away_score, away] format"""
+    rng = random.Random(seed)
+    matches = []
+    for _ in range(n):
+        home, away = rng.sample(teams, 2)
+        matches.append([home, rng.randint(0, 5), rng.randint(0, 5), away])
+    return matches
+
+
+def timed(func, *args, **kwargs):
+    """Run func once and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench_ingest(n):
+    """Batch ingest vs the sequential reference loop, then the dashboard's whole per-paste path.
+
+    Fails when batch and sequential differ or the full paste is over budget.
+    """
+    matches = make_matches(n)
+    seq_state, batch_state = make_state(), make_state()
+    (seq_rows, seq_resets), seq_time = timed(apply_matches_sequential, copy.deepcopy(matches), seq_state)
+    (batch, batch_resets), batch_time = timed(apply_matches_batch, matches, batch_state)
+    identical = seq_rows == batch.rows() and seq_resets == batch_resets and seq_state == batch_state
+    print(f"ingest        {n:>9,} matches  sequential {seq_time:8.3f}s  batch {batch_time:8.3f}s  identical={identical}")
+    if not identical:
+        raise AssertionError("batch ingest does not reproduce the sequential rows and state")
+
+    _, paste_time = timed(ingest_paste, make_dashboard_state(), matches)
+    budget = INGEST_BUDGET * max(n / 100_000, 1)
+    print(f"paste         {n:>9,} matches  batch + match_data + summaries + rolling + Elo {paste_time:8.3f}s  "
+          f"(budget {budget:.3f}s)")
+    if paste_time > budget:
+        raise AssertionError(f"a {n:,}-match paste took {paste_time:.3f}s, over the {budget:.3f}s budget")
+
+
+def bench_elo(n, chunk=100_000):
+    """Full Elo replay from a restored match store; fails unless it matches the incremental ratings"""
+    state = make_dashboard_state()
+    for start in range(0, n, chunk):
+        ingest_paste(state, make_matches(min(chunk, n - start), seed=start))
+    buffer = io.BytesIO()
+    save_snapshot(state, buffer)
+    buffer.seek(0)
+    match_data = load_snapshot(buffer)["match_data"]  # ColumnarMatchData, no rows built
+    replayed, replay_time = timed(replay_elo, TEAMS, match_data)
+    print(f"elo replay    {n:>9,} matches  {replay_time:8.3f}s  ({n / replay_time:,.0f} matches/s)")
+    if not np.array_equal(replayed["ratings"], state["elo"]["ratings"]) or replayed["matches"] != n:
+        raise AssertionError("Elo replay does not reproduce the incrementally updated ratings")
+
+
+def bench_value_bets(n_fixtures):
+    """EV/Kelly board over every fixture x market"""
+    rng = np.random.default_rng(0)
+    fixtures = [(home, away) for home, _, _, away in make_matches(n_fixtures)]
+    odds = pd.DataFrame(fixtures, columns=["home_team", "away_team"])
+    for market in MARKETS:
+        odds[market] = rng.uniform(1.05, 10.0, n_fixtures)
+    probabilities = rng.uniform(0, 1, (n_fixtures, len(MARKETS)))
+    board, board_time = timed(value_bet_board, odds, probabilities, 0.02)
+    print(f"value bets    {n_fixtures:>9,} fixtures  {board_time * 1000:8.1f}ms  ({len(board):,} value bets)")
+
+
+def bench_snapshot(n):
+    """Save/restore of a full state with n stored matches; fails unless the restore is exact"""
+    state = make_dashboard_state()
+    ingest_paste(state, make_matches(n))
+
+    buffer = io.BytesIO()
+    _, save_time = timed(save_snapshot, state, buffer)
+    buffer.seek(0)
+    restored, load_time = timed(load_snapshot, buffer)
+    _, rows_time = timed(restored["match_data"].rows)
+    print(f"snapshot      {n:>9,} matches  save {save_time:8.3f}s  load {load_time:8.3f}s  "
+          f"rows {rows_time:8.3f}s  ({buffer.getbuffer().nbytes / 2**20:.1f} MiB)")
+    mismatched = snapshot_mismatches(state, restored)
+    if mismatched:
+        raise AssertionError(f"snapshot restore changed: {', '.join(mismatched)}")
+
+
+def snapshot_mismatches(state, restored):
+    """Names of the state parts that did not survive a save/load round trip"""
+    mismatched = [
+        key for key in ("team_stats", "home_counters", "away_counters", "ha_counters", "status3_counters",
+                        "match_counter", "season_number", "season_summaries")
+        if restored[key] != state[key]
+    ]
+    if restored["match_data"].rows() != list(state["match_data"]):
+        mismatched.append("match_data")
+    history, restored_history = state["ranking_history"], restored["ranking_history"]
+    if (restored_history["teams"] != history["teams"]
+            or sorted(restored_history["seasons"]) != sorted(history["seasons"])
+            or not all(np.array_equal(restored_history["seasons"][s], history["seasons"][s]) for s in history["seasons"])):
+        mismatched.append("ranking_history")
+    rolling, restored_rolling = state["rolling_metrics"], restored["rolling_metrics"]
+    if (restored_rolling["teams"] != rolling["teams"]
+            or not all(np.array_equal(restored_rolling[name], rolling[name]) for name in ROLLING_ARRAYS)):
+        mismatched.append("rolling_metrics")
+    elo, restored_elo = state["elo"], restored["elo"]
+    if (restored_elo["teams"] != elo["teams"] or restored_elo["matches"] != elo["matches"]
+            or not np.array_equal(restored_elo["ratings"], elo["ratings"])):
+        mismatched.append("elo")
+    return mismatched
+
+
+def bench_team_names(n_lines):
+    """Alias/fuzzy resolution of messy team lines, cold index cache vs warm"""
+    rng = random.Random(0)
+    names = [alias for team in TEAMS for alias in [team, *TEAM_ALIASES.get(team, [])]]
+    lines = []
+    for _ in range(n_lines):
+        name = rng.choice(names)
+        if rng.random() < 0.3 and len(name) > 6:  # drop one character
+            cut = rng.randrange(len(name))
+            name = name[:cut] + name[cut + 1:]
+        lines.append(name)
+    index, build_time = timed(build_team_index, TEAMS)
+    resolved, cold_time = timed(lambda: [resolve_team(index, line) for line in lines])
+    _, warm_time = timed(lambda: [resolve_team(index, line) for line in lines])
+    unresolved = sum(team is None for team in resolved)
+    print(f"team names    {n_lines:>9,} lines    build {build_time * 1000:6.1f}ms  cold {cold_time:8.3f}s  "
+          f"warm {warm_time:8.3f}s  ({len(index['cache']):,} distinct, {unresolved:,} unresolved)")
+
+
+def bench_model(n, batch=500):
+    """Feature store build + partial_fit training, full history then per ingest batch"""
+    state = make_state()
+    teams = list(state["team_stats"])
+    rows, _ = apply_matches_batch(make_matches(n), state)
+    columns = match_columns(rows, teams)
+    store, model = new_feature_store(teams), new_outcome_model()
+    _, build_time = timed(append_matches, store, columns)
+    _, train_time = timed(update_model, model, store)
+
+    new_rows, _ = apply_matches_batch(make_matches(batch, seed=1), state)
+    _, step_time = timed(lambda: (append_matches(store, match_columns(new_rows, teams)), update_model(model, store)))
+    fixtures = make_matches(1_000, seed=2)
+    homes, aways = [home for home, _, _, _ in fixtures], [away for _, _, _, away in fixtures]
+    single, predict_time = timed(lambda: [
+        predict_with_model(model, store, home, away, state["season_number"]) for home, away in zip(homes, aways)
+    ])
+    # The value-bet board scores every fixture in one call per model
+    board, board_time = timed(predict_fixtures_with_model, model, store, homes, aways, state["season_number"])
+    assert board == single, "batched predictions differ from per-fixture ones"
+    print(f"model         {n:>9,} matches  features {build_time:8.3f}s  train {train_time:8.3f}s  "
+          f"+{batch} batch {step_time * 1000:6.1f}ms  predict {predict_time / len(fixtures) * 1000:.3f}ms/fixture  "
+          f"batched {board_time / len(fixtures) * 1000:.4f}ms/fixture")
+
+
+def bench_render(n):
+    """League table and one recent-feed page (10 vs 500 matches) from an n-match history"""
+    state = make_state()
+    matches = make_matches(n)
+    rows, _ = apply_matches_batch(matches, state)
+    elo = new_elo(state["team_stats"])
+    update_elo(elo, rows)
+    _, table_time = timed(league_table, state["team_stats"], elo)
+    feed_times = {size: timed(recent_feed_html, rows[-size:])[1] for size in (10, 500)}
+    print(f"render        {n:>9,} matches  table {table_time * 1000:6.2f}ms  "
+          + "  ".join(f"feed {size} {seconds * 1000:6.2f}ms" for size, seconds in feed_times.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matches", type=int, default=100_000, help="Number of matches to ingest")
+    parser.add_argument("--replay-matches", type=int, default=1_000_000, help="Number of matches for replay benchmarks")
+    args = parser.parse_args()
+    bench_ingest(args.matches)
+    bench_elo(args.replay_matches)
+    bench_snapshot(args.replay_matches)
+    bench_value_bets(1_000)
+    bench_team_names(args.matches)
+    bench_model(args.matches)
+    bench_render(args.matches)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Dashboard charts computed server-side from the columnar match store.
+
+Every series is aggregated with NumPy and reduced to at most MAX_CHART_POINTS
+points (min/max per bucket, so peaks survive) before it becomes a WebGL trace,
+keeping figure payloads bounded however much history is loaded.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+MAX_CHART_POINTS = 1_500
+TREND_WINDOW = 50  # matches in the rolling goals / BTS window
+
+
+def downsample(x, y, max_points=MAX_CHART_POINTS):
+    """Reduce a series to at most max_points, keeping each bucket's min and max"""
+    x, y = np.asarray(x), np.asarray(y, dtype=np.float64)
+    if len(x) <= max_points:
+        return x, y
+    buckets = (max_points - 1) // 2
+    edges = np.linspace(0, len(x), buckets + 1).astype(np.int64)
+    starts = edges[:-1]
+    lows = np.minimum.reduceat(y, starts)
+    highs = np.maximum.reduceat(y, starts)
+    # Position of each bucket's min and max, kept in x order
+    bucket_of = np.repeat(np.arange(buckets), np.diff(edges))
+    low_at = np.flatnonzero(y == lows[bucket_of])
+    high_at = np.flatnonzero(y == highs[bucket_of])
+    first_low = low_at[np.unique(bucket_of[low_at], return_index=True)[1]]
+    first_high = high_at[np.unique(bucket_of[high_at], return_index=True)[1]]
+    keep = np.unique(np.concatenate([first_low, first_high, [len(x) - 1]]))
+    return x[keep], y[keep]
+
+
+def team_points_progression(columns, teams, team):
+    """(match index, season points) after each of the team's matches, all seasons"""
+    t = teams.index(team)
+    home, away = columns["home"], columns["away"]
+    home_score, away_score = columns["home_score"], columns["away_score"]
+    played = np.flatnonzero((home == t) | (away == t))
+    if len(played) == 0:
+        return played, np.zeros(0)
+    is_home = home[played] == t
+    scored = np.where(is_home, home_score[played], away_score[played]).astype(np.int64)
+    conceded = np.where(is_home, away_score[played], home_score[played]).astype(np.int64)
+    points = np.where(scored > conceded, 3, np.where(scored == conceded, 1, 0))
+
+    # Cumulative points that restart every season
+    seasons = columns["season"][played]
+    total = np.cumsum(points)
+    season_start = np.r_[True, seasons[1:] != seasons[:-1]]
+    offsets = (total - points)[season_start]
+    season_points = total - np.repeat(offsets, np.diff(np.r_[np.flatnonzero(season_start), len(played)]))
+    return played + 1, season_points
+
+
+def team_position_progression(history, team):
+    """(step, table position) after every recorded match, all seasons in order"""
+    t = history["teams"].index(team)
+    seasons = sorted(history["seasons"])
+    if not seasons:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    positions = np.concatenate([history["seasons"][s][:, t] for s in seasons])
+    return np.arange(1, len(positions) + 1), positions
+
+
+def rolling_trends(columns, window=TREND_WINDOW):
+    """Rolling average goals and BTS % over the last `window` matches"""
+    home_score = columns["home_score"].astype(np.int64)
+    away_score = columns["away_score"].astype(np.int64)
+    n = len(home_score)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+
+    def rolling_mean(values):
+        total = np.cumsum(values, dtype=np.float64)
+        total[window:] = total[window:] - total[:-window]
+        return total / np.minimum(np.arange(1, n + 1), window)
+
+    goals = rolling_mean(home_score + away_score)
+    bts = rolling_mean((home_score > 0) & (away_score > 0)) * 100
+    return np.arange(1, n + 1), goals, bts
+
+
+def home_away_splits(columns, teams, season):
+    """Points per game at home and away for every team in `season`"""
+    in_season = columns["season"] == season
+    home, away = columns["home"][in_season], columns["away"][in_season]
+    home_score = columns["home_score"][in_season].astype(np.int64)
+    away_score = columns["away_score"][in_season].astype(np.int64)
+    home_points = np.where(home_score > away_score, 3, np.where(home_score == away_score, 1, 0))
+    away_points = np.where(away_score > home_score, 3, np.where(home_score == away_score, 1, 0))
+
+    size = len(teams)
+    home_games = np.bincount(home, minlength=size)
+    away_games = np.bincount(away, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        home_ppg = np.bincount(home, weights=home_points, minlength=size) / home_games
+        away_ppg = np.bincount(away, weights=away_points, minlength=size) / away_games
+    return np.nan_to_num(home_ppg), np.nan_to_num(away_ppg)
+
+
+def _layout(fig, title, y_title, **yaxis):
+    fig.update_layout(
+        title=title, height=380, margin=dict(l=10, r=10, t=40, b=10),
+        xaxis_title="Match (all seasons)", yaxis_title=y_title, hovermode="x unified",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, x=0),
+    )
+    fig.update_yaxes(**yaxis)
+    return fig
+
+
+def progression_figures(columns, teams, history, selected):
+    """Points and position progression for the selected teams"""
+    points_fig, position_fig = go.Figure(), go.Figure()
+    for team in selected:
+        x, y = downsample(*team_points_progression(columns, teams, team))
+        points_fig.add_trace(go.Scattergl(x=x, y=y, mode="lines", name=team))
+        x, y = downsample(*team_position_progression(history, team))
+        position_fig.add_trace(go.Scattergl(x=x, y=y, mode="lines", name=team))
+    return (
+        _layout(points_fig, "Points Progression", "Season points"),
+        _layout(position_fig, "Position Progression", "Position", autorange="reversed"),
+    )
+
+
+def trend_figure(columns, window=TREND_WINDOW):
+    """Rolling goals per match and BTS % on two axes"""
+    x, goals, bts = rolling_trends(columns, window)
+    fig = go.Figure()
+    gx, gy = downsample(x, goals)
+    fig.add_trace(go.Scattergl(x=gx, y=gy, mode="lines", name=f"Avg goals (last {window})"))
+    bx, by = downsample(x, bts)
+    fig.add_trace(go.Scattergl(x=bx, y=by, mode="lines", name=f"BTS % (last {window})", yaxis="y2"))
+    fig.update_layout(yaxis2=dict(title="BTS %", overlaying="y", side="right", range=[0, 100]))
+    return _layout(fig, "Goals & BTS Trend", "Goals per match")
+
+
+def home_away_figure(columns, teams, season):
+    """Home vs away points per game for the season"""
+    home_ppg, away_ppg = home_away_splits(columns, teams, season)
+    order = np.argsort(-(home_ppg + away_ppg), kind="stable")
+    names = [teams[i] for i in order]
+    fig = go.Figure([
+        go.Bar(x=names, y=np.round(home_ppg[order], 2), name="Home PPG"),
+        go.Bar(x=names, y=np.round(away_ppg[order], 2), name="Away PPG"),
+    ])
+    fig.update_layout(barmode="group")
+    _layout(fig, f"Season {season} Home/Away Points per Game", "Points per game")
+    fig.update_xaxes(title=None)
+    return fig
@@ -0,0 +1,77 @@
+"""Elo-style team ratings that carry across seasons.
+
+Ratings are updated in O(1) per ingested match. `replay_elo` rebuilds them
+from the stored match columns (no rows are built): every rating-independent
+quantity (result, goal margin multiplier, team indices) is computed with NumPy
+in one pass, leaving only the inherently sequential rating recurrence as a
+tight scalar loop.
+"""
+import numpy as np
+
+from match_store import match_columns
+
+ELO_START = 1500.0
+ELO_K = 20.0
+ELO_HOME_ADVANTAGE = 60.0  # rating points added to the home side's expectation
+
+
+def new_elo(teams):
+    """Every team starts at ELO_START"""
+    teams = list(teams)
+    return {
+        "teams": teams,
+        "index": {team: i for i, team in enumerate(teams)},
+        "ratings": np.full(len(teams), ELO_START),
+        "matches": 0,
+    }
+
+
+def elo_expected_score(home_rating, away_rating):
+    """Expected home score (win=1, draw=0.5) including home advantage"""
+    return 1 / (1 + 10 ** ((away_rating - home_rating - ELO_HOME_ADVANTAGE) / 400))
+
+
+def _run_elo(ratings, home, away, home_score, away_score):
+    """Apply the Elo recurrence in match order, updating `ratings` in place"""
+    if len(home) == 0:
+        return
+    goal_diff = np.abs(home_score - away_score)
+    # Bigger wins move ratings more (World Football Elo margin multiplier)
+    margin = np.where(goal_diff <= 1, 1.0, np.where(goal_diff == 2, 1.5, (11 + goal_diff) / 8))
+    steps = (ELO_K * margin).tolist()
+    actual = np.where(home_score > away_score, 1.0, np.where(home_score == away_score, 0.5, 0.0)).tolist()
+
+    r = ratings.tolist()
+    advantage = ELO_HOME_ADVANTAGE
+    for h, a, k, s in zip(home.tolist(), away.tolist(), steps, actual):
+        delta = k * (s - 1 / (1 + 10 ** ((r[a] - r[h] - advantage) / 400)))
+        r[h] += delta
+        r[a] -= delta
+    ratings[:] = r
+
+
+def update_elo(elo, batch):
+    """Update ratings with newly stored matches (the ColumnarMatchData from ingest)"""
+    if len(batch) == 0:
+        return
+    columns = match_columns(batch, elo["teams"])
+    _run_elo(
+        elo["ratings"],
+        columns["home"].astype(np.int64),
+        columns["away"].astype(np.int64),
+        columns["home_score"].astype(np.int64),
+        columns["away_score"].astype(np.int64),
+    )
+    elo["matches"] += len(batch)
+
+
+def replay_elo(teams, match_data):
+    """Rebuild ratings from the whole match store (all seasons, in order)"""
+    elo = new_elo(teams)
+    update_elo(elo, match_data)
+    return elo
+
+
+def team_rating(elo, team):
+    """Current rating for a team"""
+    return float(elo["ratings"][elo["index"][team]])
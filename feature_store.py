@@ -0,0 +1,159 @@
+"""Per-match pre-match feature store for the learned predictor.
+
+For every stored match the store keeps one feature row describing both teams
+*before* kick-off: recent form (last FORM_WINDOW games across seasons), season
+points and goal difference per game, league position and the combined 4-goal /
+3-goal streak counters after the team's previous match, plus the match labels.
+Rows are computed with NumPy one batch at a time from the stored match columns
+and appended; the per-team carry state lets the next batch continue exactly
+where the last one stopped.
+"""
+import numpy as np
+
+FORM_WINDOW = 5
+
+SIDE_FEATURES = ("form_gf", "form_ga", "form_ppg", "season_ppg", "season_gd", "rank", "ha_streak", "s3_streak")
+FEATURE_NAMES = tuple(f"{side}_{name}" for side in ("home", "away") for name in SIDE_FEATURES)
+MAX_GOALS_CLASS = 6  # total-goals label is capped here ("6+")
+
+
+def new_feature_store(teams):
+    """Empty store with no matches seen"""
+    teams = list(teams)
+    size = len(teams)
+    return {
+        "teams": teams,
+        "index": {team: i for i, team in enumerate(teams)},
+        # Last FORM_WINDOW (GF, GA, Pts, played) per team, oldest first
+        "recent": np.zeros((size, FORM_WINDOW, 4)),
+        # Season carry: (P, Pts, GD) so far and (rank, ha, s3) after the last match
+        "season": 0,
+        "totals": np.zeros((size, 3)),
+        "last": _default_last(size),
+        "features": np.zeros((0, len(FEATURE_NAMES)), dtype=np.float32),
+        "outcome": np.zeros(0, dtype=np.int8),
+        "goals": np.zeros(0, dtype=np.int8),
+        "bts": np.zeros(0, dtype=np.int8),
+    }
+
+
+def _default_last(size):
+    """No match yet this season: mid-table, streak counters at zero"""
+    last = np.zeros((size, 3))
+    last[:, 0] = (size + 1) / 2
+    return last
+
+
+def _side_features(form, totals, last, size):
+    """Feature columns for one side from (n, 4) form sums, (n, 3) totals and (n, 3) last values"""
+    games = np.maximum(form[:, 3], 1)
+    played = np.maximum(totals[:, 0], 1)
+    return np.column_stack([
+        form[:, 0] / games, form[:, 1] / games, form[:, 2] / games,
+        totals[:, 1] / played, totals[:, 2] / played,
+        last[:, 0] / size, last[:, 1], last[:, 2],
+    ])
+
+
+def append_matches(store, columns):
+    """Compute and append feature rows for new stored match columns (see match_store)"""
+    n = len(columns["home"])
+    if n == 0:
+        return np.zeros((0, len(FEATURE_NAMES)))
+    size = len(store["teams"])
+    home_score = columns["home_score"].astype(np.int64)
+    away_score = columns["away_score"].astype(np.int64)
+
+    # One entry per team appearance, sorted by team then match order
+    team = np.concatenate([columns["home"], columns["away"]]).astype(np.int64)
+    gf = np.concatenate([home_score, away_score])
+    ga = np.concatenate([away_score, home_score])
+    pts = np.where(gf > ga, 3, np.where(gf == ga, 1, 0))
+    season = np.concatenate([columns["season"], columns["season"]]).astype(np.int64)
+    post = np.column_stack([
+        np.concatenate([columns["home_rank"], columns["away_rank"]]),
+        np.concatenate([columns["ha_home"], columns["ha_away"]]),
+        np.concatenate([columns["s3_home"], columns["s3_away"]]),
+    ]).astype(np.float64)
+    order = np.lexsort((np.repeat([0, 1], n), np.tile(np.arange(n), 2), team))
+    team, season, post = team[order], season[order], post[order]
+    gf, ga, pts = gf[order], ga[order], pts[order]
+    values = np.column_stack([gf, ga, pts, np.ones(2 * n)])
+
+    # Recent form: each team's carried window is placed in front of its batch entries
+    window = FORM_WINDOW
+    all_team = np.concatenate([np.repeat(np.arange(size), window), team])
+    all_values = np.concatenate([store["recent"].reshape(-1, 4), values])
+    grouped = np.argsort(all_team, kind="stable")
+    all_values = all_values[grouped]
+    cumulative = np.vstack([np.zeros(4), np.cumsum(all_values, axis=0)])
+    batch_pos = np.flatnonzero(grouped >= size * window)
+    form = cumulative[batch_pos] - cumulative[batch_pos - window]
+    group_end = np.cumsum(np.bincount(all_team, minlength=size))
+    store["recent"] = all_values[group_end[:, None] - window + np.arange(window)]
+
+    # Season so far and last post-match values, restarting per (team, season) segment
+    segment_start = np.r_[True, (team[1:] != team[:-1]) | (season[1:] != season[:-1])]
+    segment = np.cumsum(segment_start) - 1
+    team_start = np.r_[True, team[1:] != team[:-1]]
+    carried = team_start[segment_start] & (season[segment_start] == store["season"])
+    seg_team = team[segment_start]
+
+    season_values = np.column_stack([np.ones(2 * n), pts, gf - ga])
+    running = np.cumsum(season_values, axis=0) - season_values
+    base = np.where(carried[:, None], store["totals"][seg_team], 0) - running[segment_start]
+    totals = running + base[segment]
+
+    previous = np.vstack([np.zeros((1, 3)), post[:-1]])
+    first_last = np.where(carried[:, None], store["last"][seg_team], _default_last(size)[seg_team])
+    last = np.where(segment_start[:, None], first_last[segment], previous)
+
+    # Back to match order: home appearances are entries [0, n), away [n, 2n)
+    unsorted = np.empty(2 * n, dtype=np.int64)
+    unsorted[order] = np.arange(2 * n)
+    home_idx, away_idx = unsorted[:n], unsorted[n:]
+    features = np.hstack([
+        _side_features(form[home_idx], totals[home_idx], last[home_idx], size),
+        _side_features(form[away_idx], totals[away_idx], last[away_idx], size),
+    ])
+    # A team drawn against itself sees its pre-match state on both sides
+    same = columns["home"] == columns["away"]
+    features[same, len(SIDE_FEATURES):] = features[same, :len(SIDE_FEATURES)]
+
+    # Carry state for the next batch: teams that played in the batch's final season
+    final_season = int(columns["season"][-1])
+    team_end = np.r_[team[1:] != team[:-1], True]
+    in_final = team_end & (season == final_season)
+    if final_season != store["season"]:
+        store["totals"] = np.zeros((size, 3))
+        store["last"] = _default_last(size)
+    store["totals"][team[in_final]] = totals[in_final] + season_values[in_final]
+    store["last"][team[in_final]] = post[in_final]
+    store["season"] = final_season
+
+    goals = home_score + away_score
+    store["features"] = np.vstack([store["features"], features.astype(np.float32)])
+    store["outcome"] = np.concatenate([store["outcome"], np.where(home_score > away_score, 0, np.where(home_score == away_score, 1, 2)).astype(np.int8)])
+    store["goals"] = np.concatenate([store["goals"], np.minimum(goals, MAX_GOALS_CLASS).astype(np.int8)])
+    store["bts"] = np.concatenate([store["bts"], ((home_score > 0) & (away_score > 0)).astype(np.int8)])
+    return features
+
+
+def fixture_features(store, home_team, away_team, season_number):
+    """Feature row for an upcoming fixture from the current carry state"""
+    return fixtures_features(store, [home_team], [away_team], season_number)
+
+
+def fixtures_features(store, home_teams, away_teams, season_number):
+    """Feature rows for many upcoming fixtures at once, one row per fixture"""
+    size = len(store["teams"])
+    sides = []
+    for teams in (home_teams, away_teams):
+        t = np.array([store["index"][team] for team in teams], dtype=np.intp)
+        if store["season"] == season_number:
+            totals, last = store["totals"][t], store["last"][t]
+        else:
+            totals, last = np.zeros((len(t), 3)), _default_last(size)[t]
+        form = store["recent"][t].sum(axis=1)
+        sides.append(_side_features(form, totals, last, size))
+    return np.hstack(sides)
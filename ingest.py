@@ -0,0 +1,432 @@
+import numpy as np
+
+from elo import update_elo
+from match_store import ColumnarMatchData, empty_columns, total_g_display
+from ranking_history import record_positions
+from rolling_metrics import update_rolling_metrics
+from season_summaries import record_batch
+
+# Number of matches a team plays before the league rolls over to a new season
+SEASON_LENGTH = 38
+
+
+# ============ STATE HELPERS ============
+def new_team_stats(teams):
+    """Empty league table for the given teams"""
+    return {
+        team: {
+            "P": 0, "W": 0, "D": 0, "L": 0,
+            "GF": 0, "GA": 0, "GD": 0, "Pts": 0, "Form": []
+        }
+        for team in teams
+    }
+
+
+def reset_season(state):
+    """Reset season stats and counters in `state` while preserving match history"""
+    teams = list(state["team_stats"])
+    state["team_stats"] = new_team_stats(teams)
+    state["home_counters"] = {team: 0 for team in teams}
+    state["away_counters"] = {team: 0 for team in teams}
+    state["ha_counters"] = {team: 0 for team in teams}
+    state["status3_counters"] = {team: 0 for team in teams}
+    state["season_number"] += 1
+    state["match_counter"] = 1
+
+
+def _copy_table(team_stats):
+    """Independent copy of a league table (Form lists included)"""
+    return {team: dict(stats, Form=list(stats["Form"])) for team, stats in team_stats.items()}
+
+
+def _first_full_team(team_stats, season_length):
+    """First team (in table order) that has completed the season, or None"""
+    for team, stats in team_stats.items():
+        if stats["P"] >= season_length:
+            return team
+    return None
+
+
+def _result_label(home_score, away_score):
+    if home_score > away_score:
+        return "Home Win"
+    if away_score > home_score:
+        return "Away Win"
+    return "Draw"
+
+
+def _build_row(match_id, home_team, home_score, away_score, away_team, home_rank, away_rank,
+               home_counter, away_counter, ha_home, ha_away, s3_home, s3_away, season_number):
+    """Assemble one stored match row (see MATCH_COLUMNS in match_store.py)"""
+    total_goals = home_score + away_score
+    return [
+        match_id, home_team, home_score, away_score, away_team,
+        total_goals, total_g_display(total_goals), _result_label(home_score, away_score),
+        home_score - away_score,
+        "Yes" if home_score > 0 and away_score > 0 else "No",
+        "Over 2.5" if total_goals > 2.5 else "Under 2.5",
+        home_rank, away_rank,
+        home_counter, away_counter,
+        ha_home, ha_away,
+        s3_home, s3_away,
+        f"{home_team}: {ha_home} | {away_team}: {ha_away}",
+        f"{home_team}: {s3_home} | {away_team}: {s3_away}",
+        season_number,
+        f"Season {season_number}"
+    ]
+
+
+# ============ SEQUENTIAL INGEST (REFERENCE) ============
+def apply_matches_sequential(matches, state, season_length=SEASON_LENGTH):
+    """Apply parsed matches one at a time.
+
+    Reference implementation of the original ingest loop; `apply_matches_batch`
+    must produce identical rows and state. Returns (rows, resets) where resets
+    lists (finished_season_number, team_that_completed_it, final_table) tuples.
+    """
+    rows, resets = [], []
+
+    def check_and_reset():
+        team = _first_full_team(state["team_stats"], season_length)
+        if team is not None:
+            resets.append((state["season_number"], team, _copy_table(state["team_stats"])))
+            reset_season(state)
+
+    # Check if we need to reset season before adding new matches
+    for home_team, _, _, away_team in matches:
+        if state["team_stats"][home_team]["P"] >= season_length or state["team_stats"][away_team]["P"] >= season_length:
+            check_and_reset()
+            break
+
+    for home_team, home_score, away_score, away_team in matches:
+        team_stats = state["team_stats"]
+        if team_stats[home_team]["P"] >= season_length or team_stats[away_team]["P"] >= season_length:
+            check_and_reset()
+            team_stats = state["team_stats"]
+
+        match_id = state["match_counter"]
+        state["match_counter"] += 1
+        total_goals = home_score + away_score
+
+        if total_goals == 4:
+            state["home_counters"][home_team] = 0
+            state["away_counters"][away_team] = 0
+            state["ha_counters"][home_team] = 0
+            state["ha_counters"][away_team] = 0
+        else:
+            state["home_counters"][home_team] += 1
+            state["away_counters"][away_team] += 1
+            state["ha_counters"][home_team] += 1
+            state["ha_counters"][away_team] += 1
+
+        if total_goals == 3:
+            state["status3_counters"][home_team] = 0
+            state["status3_counters"][away_team] = 0
+        else:
+            state["status3_counters"][home_team] += 1
+            state["status3_counters"][away_team] += 1
+
+        for team, scored, conceded in ((home_team, home_score, away_score), (away_team, away_score, home_score)):
+            stats = team_stats[team]
+            stats["P"] += 1
+            stats["GF"] += scored
+            stats["GA"] += conceded
+            stats["GD"] = stats["GF"] - stats["GA"]
+            if scored > conceded:
+                stats["W"] += 1
+                stats["Pts"] += 3
+                stats["Form"].append("W")
+            elif scored < conceded:
+                stats["L"] += 1
+                stats["Form"].append("L")
+            else:
+                stats["D"] += 1
+                stats["Pts"] += 1
+                stats["Form"].append("D")
+
+        # Keep only last 5 form results
+        for team in (home_team, away_team):
+            if len(team_stats[team]["Form"]) > 5:
+                team_stats[team]["Form"].pop(0)
+
+        rankings = sorted(
+            team_stats.items(),
+            key=lambda x: (x[1]["Pts"], x[1]["GD"], x[1]["GF"]),
+            reverse=True
+        )
+        positions = {team: pos for pos, (team, _) in enumerate(rankings, 1)}
+
+        rows.append(_build_row(
+            match_id, home_team, home_score, away_score, away_team,
+            positions[home_team], positions[away_team],
+            state["home_counters"][home_team], state["away_counters"][away_team],
+            state["ha_counters"][home_team], state["ha_counters"][away_team],
+            state["status3_counters"][home_team], state["status3_counters"][away_team],
+            state["season_number"]
+        ))
+
+    return rows, resets
+
+
+# ============ VECTORIZED BATCH INGEST ============
+def _state_arrays(state, teams):
+    """Pull the per-team season state into arrays, in table order"""
+    team_stats = state["team_stats"]
+    base = {
+        field: np.array([team_stats[team][field] for team in teams], dtype=np.int64)
+        for field in ("P", "W", "D", "L", "GF", "GA", "Pts")
+    }
+    for name in ("home", "away", "ha", "status3"):
+        counters = state[f"{name}_counters"]
+        base[name] = np.array([counters[team] for team in teams], dtype=np.int64)
+    base["Form"] = [list(team_stats[team]["Form"]) for team in teams]
+    return base
+
+
+def _empty_arrays(n_teams):
+    """Per-team arrays for a freshly reset season"""
+    base = {
+        field: np.zeros(n_teams, dtype=np.int64)
+        for field in ("P", "W", "D", "L", "GF", "GA", "Pts", "home", "away", "ha", "status3")
+    }
+    base["Form"] = [[] for _ in range(n_teams)]
+    return base
+
+
+def _season_breaks(home, away, played, season_length):
+    """Find the matches that open a new season inside a batch.
+
+    Mirrors the per-match check of the sequential loop: a match whose home or
+    away team has already played `season_length` games resets the league
+    first. Returns (break_indices, team_that_completed_each_season).
+    """
+    n, n_teams = len(home), len(played)
+    # A season holds at most n_teams * season_length / 2 matches before some
+    # team starts its (season_length + 1)th, so each search window is bounded.
+    window = n_teams * season_length // 2 + 1
+    breaks, full_teams = [], []
+    start = 0
+    while start < n:
+        end = min(n, start + window)
+        steps = np.arange(end - start)
+        h, a = home[start:end], away[start:end]
+        appearances = np.zeros((end - start, n_teams), dtype=np.int64)
+        appearances[steps, h] += 1
+        appearances[steps, a] += 1
+        played_after = np.cumsum(appearances, axis=0) + played
+        played_before = played_after - appearances
+        trigger = (played_before[steps, h] >= season_length) | (played_before[steps, a] >= season_length)
+        hits = np.flatnonzero(trigger)
+        if len(hits):
+            breaks.append(start + hits[0])
+            full_teams.append(np.flatnonzero(played_before[hits[0]] >= season_length)[0])
+            played = np.zeros(n_teams, dtype=np.int64)
+            start += hits[0]
+        else:
+            played = played_after[-1]
+            start = end
+    return breaks, full_teams
+
+
+def _run_counters(event_keys, event_resets, base, order=None):
+    """Games-since counters after each event.
+
+    Events are in time order and grouped by key (team, or season * teams + team);
+    a counter drops to 0 on a reset event and otherwise grows by 1, starting
+    from `base[key]`. `order` may pass in the stable argsort of `event_keys`
+    when several counters share keys. Returns the per-event values and the
+    final counter per key.
+    """
+    if order is None:
+        order = np.argsort(event_keys, kind="stable")
+    keys_sorted = event_keys[order]
+    k = np.arange(len(order))
+    group_start = np.searchsorted(keys_sorted, keys_sorted, side="left")
+    group_end = np.searchsorted(keys_sorted, keys_sorted, side="right") - 1
+    # Position of the latest reset at or before each event, within its group
+    last_reset = np.maximum.accumulate(np.where(event_resets[order], k, group_start - 1))
+    values_sorted = np.where(
+        last_reset >= group_start,
+        k - last_reset,
+        base[keys_sorted] + k - group_start + 1
+    )
+    values = np.empty_like(values_sorted)
+    values[order] = values_sorted
+    final = base.copy()
+    is_last = k == group_end
+    final[keys_sorted[is_last]] = values_sorted[is_last]
+    return values, final
+
+
+def _table_key(pts, gd, gf):
+    """Pack (Pts, GD, GF) into one int64 that orders like the ranking tuple"""
+    pts, gd, gf = (np.asarray(values, dtype=np.int64) for values in (pts, gd, gf))
+    return (pts << 42) + ((gd + (1 << 20)) << 21) + gf
+
+
+def apply_matches_batch(matches, state, season_length=SEASON_LENGTH, history=None):
+    """Apply a whole parsed paste at once using NumPy cumulative operations.
+
+    Produces exactly the rows and end state of `apply_matches_sequential`,
+    including the season roll-over once a team has played `season_length`
+    matches. When a ranking `history` is given, the full table position of
+    every team after every match is recorded into it. Returns (batch, resets):
+    the new matches as a ColumnarMatchData, whose rows are only built when read.
+    """
+    teams = list(state["team_stats"])
+    if not matches:
+        return ColumnarMatchData(empty_columns(), teams), []
+
+    index = {team: i for i, team in enumerate(teams)}
+    n, n_teams = len(matches), len(teams)
+    # One comprehension per column: zip(*matches) over 100k lists costs more than all four
+    home = np.array([index[match[0]] for match in matches], dtype=np.int64)
+    away = np.array([index[match[3]] for match in matches], dtype=np.int64)
+    home_score = np.array([match[1] for match in matches], dtype=np.int64)
+    away_score = np.array([match[2] for match in matches], dtype=np.int64)
+
+    base = _state_arrays(state, teams)
+    season_number = state["season_number"]
+    match_counter = state["match_counter"]
+    resets = []
+
+    # Check if we need to reset season before adding new matches
+    if (base["P"][home] >= season_length).any() or (base["P"][away] >= season_length).any():
+        full = np.flatnonzero(base["P"] >= season_length)[0]
+        resets.append((season_number, teams[full], _copy_table(state["team_stats"])))
+        base = _empty_arrays(n_teams)
+        season_number += 1
+        match_counter = 1
+
+    breaks, full_teams = _season_breaks(home, away, base["P"], season_length)
+    n_seasons = len(breaks) + 1
+    starts = np.array([0] + breaks, dtype=np.int64)
+    season_idx = np.zeros(n, dtype=np.int64)
+    season_idx[breaks] = 1
+    season_idx = np.cumsum(season_idx)
+    steps = np.arange(n)
+
+    home_win = home_score > away_score
+    away_win = away_score > home_score
+    draw = ~(home_win | away_win)
+    home_pts = np.where(home_win, 3, np.where(draw, 1, 0))
+    away_pts = np.where(away_win, 3, np.where(draw, 1, 0))
+    total = home_score + away_score
+
+    # Running Pts/GF/GA for every team after every match, restarted at each season.
+    # Home and away are added separately so a team listed on both sides counts twice.
+    # int32 is ample (at most ~127 goals per match over the batch) and halves memory traffic.
+    running = np.zeros((3, n, n_teams), dtype=np.int32)
+    for d, home_vals, away_vals in ((0, home_pts, away_pts), (1, home_score, away_score), (2, away_score, home_score)):
+        running[d, steps, home] += home_vals
+        running[d, steps, away] += away_vals
+    np.cumsum(running, axis=1, out=running)
+    # Restart each later season in place, last season first so earlier totals are still cumulative
+    for start, stop in reversed(list(zip(starts[1:].tolist(), starts[2:].tolist() + [n]))):
+        running[:, start:stop] -= running[:, start - 1:start]
+    first_stop = starts[1] if n_seasons > 1 else n
+    running[:, :first_stop] += np.array([base["Pts"], base["GF"], base["GA"]], dtype=np.int32)[:, None, :]
+    pts, gf, ga = running
+
+    # Rank snapshot after each match: sorted() is stable, so ties keep table order
+    order = np.argsort(-_table_key(pts, gf - ga, gf), axis=1, kind="stable")
+    positions = np.empty((n, n_teams), dtype=np.int8)
+    np.put_along_axis(positions, order, np.arange(1, n_teams + 1, dtype=np.int8)[None, :], axis=1)
+    home_rank, away_rank = positions[steps, home], positions[steps, away]
+    del running, order
+
+    # Counters run per (season, team); only the first season starts from existing values
+    def counter_base(name):
+        values = np.zeros(n_seasons * n_teams, dtype=np.int64)
+        values[:n_teams] = base[name]
+        return values
+
+    both = np.column_stack([home, away]).ravel()
+    both_keys = np.repeat(season_idx, 2) * n_teams + both
+    home_counter, home_final = _run_counters(season_idx * n_teams + home, total == 4, counter_base("home"))
+    away_counter, away_final = _run_counters(season_idx * n_teams + away, total == 4, counter_base("away"))
+    both_order = np.argsort(both_keys, kind="stable")
+    ha, ha_final = _run_counters(both_keys, np.repeat(total == 4, 2), counter_base("ha"), both_order)
+    s3, s3_final = _run_counters(both_keys, np.repeat(total == 3, 2), counter_base("status3"), both_order)
+    ha, s3 = ha.reshape(n, 2), s3.reshape(n, 2)
+    # Counters are read after both sides are updated
+    same = home == away
+    ha_home = np.where(same, ha[:, 1], ha[:, 0])
+    s3_home = np.where(same, s3[:, 1], s3[:, 0])
+
+    # Final table of every season in the batch; the last one becomes the live state
+    n_groups = n_seasons * n_teams
+    win_flags = np.column_stack([home_win, away_win]).ravel()
+    draw_flags = np.repeat(draw, 2)
+    loss_flags = np.column_stack([away_win, home_win]).ravel()
+
+    def tally(flags=None):
+        return np.bincount(both_keys, flags, n_groups).astype(np.int64).reshape(n_seasons, n_teams)
+
+    played, wins, draws, losses = tally(), tally(win_flags), tally(draw_flags), tally(loss_flags)
+    for field, values in (("P", played), ("W", wins), ("D", draws), ("L", losses)):
+        values[0] += base[field]
+    ends = np.append(starts[1:], n) - 1
+    season_pts, season_gf, season_ga = pts[ends].tolist(), gf[ends].tolist(), ga[ends].tolist()
+    played, wins, draws, losses = played.tolist(), wins.tolist(), draws.tolist(), losses.tolist()
+
+    # Form: last five results per (season, team), interleaved home then away like the sequential loop
+    results = np.where(win_flags, "W", np.where(draw_flags, "D", "L"))[both_order].tolist()
+    bounds = np.searchsorted(both_keys[both_order], np.arange(n_groups + 1)).tolist()
+    tables = []
+    for s in range(n_seasons):
+        table = {}
+        for i, team in enumerate(teams):
+            group = s * n_teams + i
+            recent = results[max(bounds[group], bounds[group + 1] - 5):bounds[group + 1]]
+            table[team] = {
+                "P": played[s][i], "W": wins[s][i], "D": draws[s][i], "L": losses[s][i],
+                "GF": season_gf[s][i], "GA": season_ga[s][i], "GD": season_gf[s][i] - season_ga[s][i],
+                "Pts": season_pts[s][i], "Form": ((base["Form"][i] if s == 0 else []) + recent)[-5:]
+            }
+        tables.append(table)
+    resets.extend((season_number + s, teams[full], tables[s]) for s, full in enumerate(full_teams))
+
+    last = n_seasons - 1
+    state["team_stats"] = tables[last]
+    last_slice = slice(last * n_teams, (last + 1) * n_teams)
+    for name, final in (("home", home_final), ("away", away_final), ("ha", ha_final), ("status3", s3_final)):
+        final = final[last_slice]
+        state[f"{name}_counters"] = {team: int(final[index[team]]) for team in state[f"{name}_counters"]}
+
+    first_ids = np.ones(n_seasons, dtype=np.int64)
+    first_ids[0] = match_counter
+    match_ids = first_ids[season_idx] + steps - starts[season_idx]
+    seasons = season_number + season_idx
+    if history is not None:
+        # Timeline column j holds history["teams"][j], so pick that team's batch column
+        columns = [teams.index(team) for team in history["teams"]]
+        for i, (start, stop) in enumerate(zip(starts.tolist(), starts[1:].tolist() + [n])):
+            record_positions(history, season_number + i, positions[start:stop][:, columns])
+    state["season_number"] = season_number + last
+    state["match_counter"] = int(match_ids[-1]) + 1
+
+    batch = ColumnarMatchData({
+        "match_id": match_ids, "home": home, "home_score": home_score, "away_score": away_score, "away": away,
+        "home_rank": home_rank, "away_rank": away_rank,
+        "home_counter": home_counter, "away_counter": away_counter,
+        "ha_home": ha_home, "ha_away": ha[:, 1], "s3_home": s3_home, "s3_away": s3[:, 1],
+        "season": seasons,
+    }, teams)
+    return batch, resets
+
+
+# ============ DASHBOARD PASTE ============
+def ingest_paste(state, matches, season_length=SEASON_LENGTH):
+    """Everything one parsed paste updates in the dashboard state.
+
+    Applies the batch (ranking timeline included), appends it to match_data
+    and feeds the same columns to the season summaries, rolling metrics and
+    Elo ratings, which all carry across season resets. Returns (batch, resets).
+    """
+    batch, resets = apply_matches_batch(matches, state, season_length, history=state["ranking_history"])
+    state["match_data"].extend(batch)
+    record_batch(state["season_summaries"], batch, resets)
+    update_rolling_metrics(state["rolling_metrics"], batch)
+    update_elo(state["elo"], batch)
+    return batch, resets
@@ -0,0 +1,229 @@
+"""Local load test: concurrent simulated dashboard sessions through Streamlit's AppTest.
+
+Every simulated analyst pastes messy match data, flips the predictor controls
+and prepares a snapshot export, round after round. The sessions of one
+concurrency level start together. By default they share one server process
+(one GIL, one st.cache_resource), like analysts on the same Streamlit server;
+--isolated gives each session its own process instead, i.e. N separate
+servers. Each level runs in fresh processes, so peak RSS is per level. The
+report shows latency percentiles, peak RSS and throughput for each session
+count.
+
+Run with:  python loadtest.py [--sessions 1 2 4 8] [--rounds 3] [--matches 150] [--isolated]
+"""
+import argparse
+import contextlib
+import multiprocessing
+import queue
+import random
+import resource
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from benchmark import TEAMS, make_matches
+
+APP_PATH = Path(__file__).with_name("oddbet.py")
+FORM_CHOICES = ["Season averages", "Last 5 (home/away)", "Last 10 (home/away)", "Time-decayed (home/away)"]
+PREDICTORS = ["Heuristic", "Learned model (SGD)"]
+PERCENTILES = (50, 95, 99)
+
+
+def messy_paste(matches, week):
+    """Raw text in the scraped-feed layout the parser cleans up"""
+    lines = []
+    for i, (home, home_score, away_score, away) in enumerate(matches):
+        lines += [
+            f"English League WEEK {week} - #{2025120000 + i}", f"{1 + i % 12}:{i % 60:02d} pm",
+            home, str(home_score), str(away_score), away,
+        ]
+    return "\n".join(lines)
+
+
+def _peak_rss_mib():
+    """Peak resident set size of this process so far (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _button(at, label_prefix):
+    return next(button for button in at.button if button.label.startswith(label_prefix))
+
+
+def run_session(session_id, rounds, matches_per_round, timings, server_lock=None):
+    """One analyst's scripted session; appends (interaction, seconds) to `timings`.
+
+    With a `server_lock`, every script run holds it and its time includes the
+    wait for other sessions' runs.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(session_id)
+    at = AppTest.from_file(str(APP_PATH), default_timeout=300)
+    server_lock = server_lock or contextlib.nullcontext()
+
+    def timed(name, action):
+        start = time.perf_counter()
+        with server_lock:
+            action()
+        timings.append((name, time.perf_counter() - start))
+        if at.exception:
+            raise RuntimeError(f"session {session_id}: {name} raised {at.exception[0].value}")
+
+    timed("first_render", at.run)
+    for round_number in range(rounds):
+        paste = messy_paste(make_matches(matches_per_round, seed=session_id * 1000 + round_number), round_number + 1)
+        at.text_area[0].input(paste)
+        timed("paste", lambda: _button(at, "🚀 Parse").click().run())
+
+        home, away = rng.sample(TEAMS, 2)
+        at.selectbox(key="home_select").set_value(home)
+        timed("select_teams", lambda: at.selectbox(key="away_select").set_value(away).run())
+        timed("form_window", lambda: at.selectbox(key="form_window").set_value(rng.choice(FORM_CHOICES)).run())
+        timed("toggle_elo", lambda: at.checkbox(key="use_elo").set_value(rng.random() < 0.5).run())
+        timed("predictor", lambda: at.radio(key="predictor_backend").set_value(rng.choice(PREDICTORS)).run())
+        timed("export", lambda: _button(at, "📦 Prepare Snapshot").click().run())
+
+
+def _import_app_dependencies():
+    # Import the app's heavy dependencies before the baseline RSS reading
+    import plotly.graph_objects  # noqa: F401
+    import sklearn.linear_model  # noqa: F401
+    import streamlit.testing.v1  # noqa: F401
+
+
+def _session_result(session_id, rounds, matches_per_round, start_barrier, server_lock=None):
+    timings, error = [], None
+    start_barrier.wait()
+    started = time.time()
+    try:
+        run_session(session_id, rounds, matches_per_round, timings, server_lock)
+    except Exception as e:  # reported by the parent, never silently dropped
+        error = f"{type(e).__name__}: {e}"
+    return {"timings": timings, "started": started, "finished": time.time(), "error": error}
+
+
+def _session_worker(session_id, rounds, matches_per_round, start_barrier, results):
+    """One session alone in its own process (--isolated)"""
+    _import_app_dependencies()
+    baseline_rss = _peak_rss_mib()
+    result = _session_result(session_id, rounds, matches_per_round, start_barrier)
+    results.put({**result, "baseline_rss": baseline_rss, "peak_rss": _peak_rss_mib(), "sharing": 1})
+
+
+def _server_worker(sessions, rounds, matches_per_round, results):
+    """All sessions of a level as threads of one process, like one Streamlit server.
+
+    They share the GIL and every st.cache_resource. AppTest cannot run scripts
+    from several threads at once, so script runs are serialized behind one
+    lock; a session's interaction waits while another session's run holds it.
+    """
+    _import_app_dependencies()
+    baseline_rss = _peak_rss_mib()
+    server_lock, start_barrier = threading.Lock(), threading.Barrier(sessions)
+    collected = [None] * sessions
+
+    def session(i):
+        collected[i] = _session_result(i, rounds, matches_per_round, start_barrier, server_lock)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    peak_rss = _peak_rss_mib()
+    for result in collected:
+        results.put({**result, "baseline_rss": baseline_rss, "peak_rss": peak_rss, "sharing": sessions})
+
+
+def run_level(sessions, rounds, matches_per_round, isolated=False):
+    """Run `sessions` concurrent sessions, released together.
+
+    By default they share one freshly spawned server process (see
+    _server_worker), which reproduces contention between analysts on one
+    server. With `isolated`, each session gets its own process: the numbers
+    then model N separate servers and throughput scales with cores. Returns
+    one result dict per session.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    if isolated:
+        start_barrier = context.Barrier(sessions)
+        processes = [
+            context.Process(target=_session_worker, args=(i, rounds, matches_per_round, start_barrier, results))
+            for i in range(sessions)
+        ]
+    else:
+        processes = [context.Process(target=_server_worker, args=(sessions, rounds, matches_per_round, results))]
+    for process in processes:
+        process.start()
+    collected = []
+    while len(collected) < sessions:
+        try:
+            collected.append(results.get(timeout=1))
+        except queue.Empty:
+            dead = [process for process in processes if process.exitcode not in (None, 0)]
+            if dead:
+                for process in processes:
+                    process.terminate()
+                raise RuntimeError(f"load-test session exited with code {dead[0].exitcode}")
+    for process in processes:
+        process.join()
+    return collected
+
+
+def percentiles(seconds):
+    return np.percentile(np.array(seconds) * 1000, PERCENTILES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8], help="Concurrent session counts to test")
+    parser.add_argument("--rounds", type=int, default=3, help="Paste/predict/export rounds per session")
+    parser.add_argument("--matches", type=int, default=150, help="Matches pasted per round")
+    parser.add_argument("--isolated", action="store_true", help="One process per session (N separate servers)")
+    args = parser.parse_args()
+
+    if args.isolated:
+        print("Isolated: one process per session, i.e. N separate servers (no shared GIL or caches)")
+    else:
+        print("Shared: all sessions in one server process (one GIL, one st.cache_resource)")
+    print(f"{'sessions':>8} {'actions':>8} {'wall s':>8} {'actions/s':>10} "
+          + " ".join(f"{'p' + str(p) + ' ms':>9}" for p in PERCENTILES)
+          + f" {'peak MiB':>9} {'MiB/session':>12}")
+    by_interaction = {}
+    for sessions in args.sessions:
+        level = run_level(sessions, args.rounds, args.matches, args.isolated)
+        for result in level:
+            if result["error"]:
+                print(f"  ! {result['error']}")
+        timings = [timing for result in level for timing in result["timings"]]
+        if not timings:
+            continue
+        seconds = [elapsed for _, elapsed in timings]
+        wall = max(result["finished"] for result in level) - min(result["started"] for result in level)
+        peak = max(result["peak_rss"] for result in level)
+        # A shared server's growth is split across the sessions it hosts
+        per_session = np.mean([(result["peak_rss"] - result["baseline_rss"]) / result["sharing"] for result in level])
+        print(f"{sessions:>8} {len(seconds):>8} {wall:>8.2f} {len(seconds) / wall:>10.2f} "
+              + " ".join(f"{value:>9.1f}" for value in percentiles(seconds))
+              + f" {peak:>9.1f} {per_session:>12.1f}")
+        grouped = defaultdict(list)
+        for name, elapsed in timings:
+            grouped[name].append(elapsed)
+        by_interaction[sessions] = grouped
+
+    if by_interaction:
+        sessions = max(by_interaction)
+        print(f"\nPer-interaction latency at {sessions} sessions (ms)")
+        print(f"{'interaction':>14} {'count':>6} " + " ".join(f"{'p' + str(p):>9}" for p in PERCENTILES))
+        for name, seconds in by_interaction[sessions].items():
+            print(f"{name:>14} {len(seconds):>6} " + " ".join(f"{value:>9.1f}" for value in percentiles(seconds)))
+
+
+if __name__ == "__main__":
+    main()
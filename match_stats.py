@@ -0,0 +1,78 @@
+"""Predictor inputs computed from the stored match columns.
+
+Per-team metrics and head-to-head records are counted with NumPy over the
+columns (see match_store), so the default predictor never builds match rows.
+"""
+import numpy as np
+
+
+def compute_team_metrics(team_stats, columns, teams):
+    """Season rates and averages per team, with BTS counted over the whole stored history
+
+    `columns` are stored match columns whose team indices follow `teams`.
+    """
+    both_scored = (columns["home_score"] > 0) & (columns["away_score"] > 0)
+    size = len(teams)
+    bts_counts = (
+        np.bincount(columns["home"][both_scored], minlength=size)
+        + np.bincount(columns["away"][both_scored], minlength=size)
+    )
+
+    metrics = {}
+    for i, team in enumerate(teams):
+        stats = team_stats[team]
+        total_matches = stats["P"]
+        if total_matches > 0:
+            win_rate = stats["W"] / total_matches * 100
+            draw_rate = stats["D"] / total_matches * 100
+            loss_rate = stats["L"] / total_matches * 100
+            avg_gf = stats["GF"] / total_matches
+            avg_ga = stats["GA"] / total_matches
+            bts_rate = int(bts_counts[i]) / total_matches * 100
+            points_per_game = round(stats["Pts"] / total_matches, 2)
+        else:
+            win_rate = draw_rate = loss_rate = avg_gf = avg_ga = bts_rate = points_per_game = 0
+
+        metrics[team] = {
+            "win_rate": round(win_rate, 1),
+            "draw_rate": round(draw_rate, 1),
+            "loss_rate": round(loss_rate, 1),
+            "avg_gf": round(avg_gf, 2),
+            "avg_ga": round(avg_ga, 2),
+            "bts_rate": round(bts_rate, 1),
+            "form": stats["Form"][-5:],
+            "points_per_game": points_per_game,
+        }
+    return metrics
+
+
+def head_to_head_stats(columns, teams, home_team, away_team):
+    """Record of every stored meeting between two teams, from `home_team`'s side, or None"""
+    home, away = teams.index(home_team), teams.index(away_team)
+    meetings = ((columns["home"] == home) & (columns["away"] == away)) | (
+        (columns["home"] == away) & (columns["away"] == home)
+    )
+    total_matches = int(meetings.sum())
+    if total_matches == 0:
+        return None
+
+    home_score = columns["home_score"][meetings].astype(np.int64)
+    away_score = columns["away_score"][meetings].astype(np.int64)
+    # Goal margin from home_team's point of view, whichever side it played on
+    margin = np.where(columns["home"][meetings] == home, home_score - away_score, away_score - home_score)
+    goals = home_score + away_score
+
+    stats = {
+        "total_matches": total_matches,
+        "home_wins": int((margin > 0).sum()),
+        "away_wins": int((margin < 0).sum()),
+        "draws": int((margin == 0).sum()),
+        "avg_goals": round(int(goals.sum()) / total_matches, 2),
+        "over_2_5": int((goals > 2).sum()),
+        "over_3_5": int((goals > 3).sum()),
+        "both_teams_score": int(((home_score > 0) & (away_score > 0)).sum()),
+    }
+    stats["over_2_5_pct"] = round(stats["over_2_5"] / total_matches * 100, 1)
+    stats["over_3_5_pct"] = round(stats["over_3_5"] / total_matches * 100, 1)
+    stats["both_teams_score_pct"] = round(stats["both_teams_score"] / total_matches * 100, 1)
+    return stats
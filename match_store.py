@@ -0,0 +1,176 @@
+"""Columnar form of the stored match rows.
+
+Every column of a match row is either stored here as a compact NumPy array or
+derived from those arrays (result labels, Total-G display, counter summaries,
+season label). Ingest hands over each batch as columns; `rows_from_columns`
+builds the list-of-rows form only when a row is actually read.
+"""
+from collections.abc import Sequence
+
+import numpy as np
+
+MATCH_COLUMNS = [
+    "Match_ID", "Home_Team", "Home_Score", "Away_Score", "Away_Team",
+    "Total_Goals", "Total-G", "Match_Result", "Goal_Difference",
+    "Both_Teams_Scored", "Over_Under", "Home_Rank", "Away_Rank",
+    "Games_Since_Last_Won_Home", "Games_Since_Last_Won_Away",
+    "Games_Since_Last_Won_Combined_Home", "Games_Since_Last_Won_Combined_Away",
+    "Games_Since_Last_3Goals_Home", "Games_Since_Last_3Goals_Away",
+    "F!=4HA", "Status3", "Season_Number", "Season_Label"
+]
+
+# Stored column -> (row position, dtype); "home"/"away" are indices into the team list
+STORED_COLUMNS = {
+    "match_id": (0, np.int32),
+    "home": (1, np.int8),
+    "home_score": (2, np.int8),
+    "away_score": (3, np.int8),
+    "away": (4, np.int8),
+    "home_rank": (11, np.int8),
+    "away_rank": (12, np.int8),
+    "home_counter": (13, np.int32),
+    "away_counter": (14, np.int32),
+    "ha_home": (15, np.int32),
+    "ha_away": (16, np.int32),
+    "s3_home": (17, np.int32),
+    "s3_away": (18, np.int32),
+    "season": (21, np.int32),
+}
+
+_RESULT_LABELS = np.array(["Home Win", "Away Win", "Draw"], dtype=object)
+_YES_NO = np.array(["No", "Yes"], dtype=object)
+_OVER_UNDER = np.array(["Under 2.5", "Over 2.5"], dtype=object)
+
+
+def total_g_display(total_goals):
+    if total_goals == 4:
+        return "Won"
+    if total_goals == 3:
+        return "3 ✔"
+    return str(total_goals)
+
+
+def rows_to_columns(rows, teams):
+    """Stored columns for a list of match rows"""
+    index = {team: i for i, team in enumerate(teams)}
+    columns = {}
+    for name, (position, dtype) in STORED_COLUMNS.items():
+        if name in ("home", "away"):
+            values = [index[row[position]] for row in rows]
+        else:
+            values = [row[position] for row in rows]
+        columns[name] = np.array(values, dtype=dtype)
+    return columns
+
+
+def concat_columns(first, second):
+    """Append one set of stored columns to another"""
+    return {name: np.concatenate([first[name], second[name]]) for name in STORED_COLUMNS}
+
+
+def rows_from_columns(columns, teams):
+    """Rebuild match rows from stored columns"""
+    names = np.array(teams, dtype=object)
+    home_names = names[columns["home"]].tolist()
+    away_names = names[columns["away"]].tolist()
+    home_score = columns["home_score"].astype(np.int64)
+    away_score = columns["away_score"].astype(np.int64)
+    total = home_score + away_score
+    home_win, away_win = home_score > away_score, away_score > home_score
+
+    total_list = total.tolist()
+    display = [total_g_display(t) for t in range(max(total_list, default=0) + 1)]
+    ha_home, ha_away = columns["ha_home"].tolist(), columns["ha_away"].tolist()
+    s3_home, s3_away = columns["s3_home"].tolist(), columns["s3_away"].tolist()
+    seasons = columns["season"].tolist()
+    labels = {season: f"Season {season}" for season in set(seasons)}
+    row_columns = [
+        columns["match_id"].tolist(), home_names, home_score.tolist(), away_score.tolist(), away_names,
+        total_list,
+        [display[t] for t in total_list],
+        _RESULT_LABELS[np.where(home_win, 0, np.where(away_win, 1, 2))].tolist(),
+        (home_score - away_score).tolist(),
+        _YES_NO[((home_score > 0) & (away_score > 0)).astype(np.int64)].tolist(),
+        _OVER_UNDER[(total > 2.5).astype(np.int64)].tolist(),
+        columns["home_rank"].tolist(), columns["away_rank"].tolist(),
+        columns["home_counter"].tolist(), columns["away_counter"].tolist(),
+        ha_home, ha_away,
+        s3_home, s3_away,
+        [f"{ht}: {hv} | {at}: {av}" for ht, hv, at, av in zip(home_names, ha_home, away_names, ha_away)],
+        [f"{ht}: {hv} | {at}: {av}" for ht, hv, at, av in zip(home_names, s3_home, away_names, s3_away)],
+        seasons,
+        [labels[season] for season in seasons],
+    ]
+    return list(map(list, zip(*row_columns)))
+
+
+class ColumnarMatchData(Sequence):
+    """match_data backed by stored columns: every ingest batch and snapshot restore.
+
+    Behaves like the usual list of rows: single rows and slices are built on
+    demand, and the full list is built the first time it is iterated. Built
+    rows are kept, so after new matches are appended with `extend`/`append`
+    only those are built on the next full read.
+    """
+
+    def __init__(self, columns, teams):
+        self.columns = {name: np.asarray(columns[name], dtype=dtype) for name, (_, dtype) in STORED_COLUMNS.items()}
+        self.teams = list(teams)
+        self._rows = []  # rows built so far, always a prefix of the stored matches
+
+    def __len__(self):
+        return len(self.columns["match_id"])
+
+    def _slice_rows(self, start, stop):
+        if stop <= len(self._rows):
+            return self._rows[start:stop]
+        part = {name: values[start:stop] for name, values in self.columns.items()}
+        return rows_from_columns(part, self.teams)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step == 1:
+                return self._slice_rows(start, max(start, stop))
+            return self.rows()[item]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("match index out of range")
+        return self._slice_rows(item, item + 1)[0]
+
+    def __iter__(self):
+        return iter(self.rows())
+
+    def rows(self):
+        """Full list of rows (each row is built once)"""
+        built = len(self._rows)
+        if built < len(self):
+            self._rows.extend(self._slice_rows(built, len(self)))
+        return self._rows
+
+    def append(self, row):
+        self.extend([row])
+
+    def extend(self, matches):
+        """Append match rows, or another ColumnarMatchData without building its rows"""
+        self.columns = concat_columns(self.columns, match_columns(matches, self.teams))
+
+
+def empty_columns():
+    """Stored columns holding no matches"""
+    return {name: np.zeros(0, dtype=dtype) for name, (_, dtype) in STORED_COLUMNS.items()}
+
+
+def match_columns(match_data, teams):
+    """Stored columns for match_data, without building rows when they already exist as columns"""
+    if isinstance(match_data, ColumnarMatchData):
+        if match_data.teams == list(teams):
+            return match_data.columns
+        # Same matches under another team order: only the team indices change
+        index = {team: i for i, team in enumerate(teams)}
+        remap = np.array([index[team] for team in match_data.teams], dtype=STORED_COLUMNS["home"][1])
+        columns = dict(match_data.columns)
+        columns["home"], columns["away"] = remap[columns["home"]], remap[columns["away"]]
+        return columns
+    return rows_to_columns(list(match_data), teams)
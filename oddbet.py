@@ -1,6 +1,28 @@
+import time
+
+# Render time of each script run is measured from here, so a process's first
+# run includes the cost of importing streamlit, pandas and NumPy
+RUN_START = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
+import io
+import os
 import re
+from functools import partial
+
+from elo import elo_expected_score, new_elo, replay_elo, team_rating
+from feature_store import append_matches, new_feature_store
+from ingest import SEASON_LENGTH, ingest_paste, reset_season
+from match_stats import compute_team_metrics, head_to_head_stats
+from match_store import MATCH_COLUMNS, ColumnarMatchData, empty_columns, match_columns
+from ranking_history import biggest_movers, new_ranking_history, season_length_recorded, table_as_of
+from rolling_metrics import WINDOWS, new_rolling_metrics, window_metrics
+from season_summaries import compare_seasons, finalize_season, new_season_summaries, season_rates
+from snapshot import load_snapshot, save_snapshot
+from team_names import build_team_index, resolve_team
+from value_bets import MARKETS, combine_snapshots, load_odds_folder, model_probabilities, read_odds_file, value_bet_board
+from views import FEED_PAGE_SIZES, feed_page_bounds, league_table, recent_feed_html
 
 # Allowed team names (case-sensitive)
 VALID_TEAMS = {
@@ -10,12 +32,64 @@ VALID_TEAMS = {
     "Fulham", "Manchester Reds"
 }
 
+# Lines that are never team names or scores (dates, times, match references)
+SKIP_LINE_PATTERN = re.compile(
+    r'WEEK \d+|English League|\d{1,2}:\d{2}\s*(?:am|pm)|#\d+|^\d{8,}$', re.IGNORECASE
+)
+
+# Prebuilt aggregate state new sessions start from (save one via 💾 Session Snapshot)
+STARTUP_SNAPSHOT = os.environ.get("ODDBET_STARTUP_SNAPSHOT", "startup_state.npz")
+
+# Sections below the league table, computed only when selected
+DASHBOARD_SECTIONS = ["🎯 Match Predictor", "💹 Value Bets", "📉 Charts", "📚 Season Comparison", "💾 Export"]
+DEFAULT_SECTIONS = ["🎯 Match Predictor"]
+
+# Table History opens on the position changes over this many recent matches
+MOVERS_WINDOW = 10
+
+@st.cache_resource(max_entries=1)
+def read_startup_snapshot(path, mtime_ns):
+    """Raw snapshot bytes, read from disk once per file version (only the latest is kept)"""
+    with open(path, "rb") as file:
+        return file.read()
+
+@st.cache_resource
+def render_timings():
+    """Time-to-first-render (ms) of recent sessions in this server process"""
+    return []
+
+@st.cache_resource
+def get_team_index():
+    """Alias/trigram index for VALID_TEAMS, built once per server process"""
+    return build_team_index(sorted(VALID_TEAMS))
+
+def apply_restored_state(restored):
+    """Copy a loaded snapshot into the session; parts an older snapshot lacks are reset"""
+    for key, value in restored.items():
+        st.session_state[key] = value
+    if "ranking_history" not in restored:
+        # A kept timeline would describe other matches, possibly in another team order
+        st.session_state.ranking_history = new_ranking_history(st.session_state.team_stats)
+    if "elo" not in restored:
+        # Ratings carry across seasons, so rebuild them from the restored history
+        st.session_state.elo = replay_elo(st.session_state.team_stats, st.session_state.match_data)
+
 st.set_page_config(page_title="Football Results Dashboard", page_icon="⚽", layout="wide")
 st.title("⚽ Complete Football Analytics Dashboard")
 
 # ============ SESSION STATE INITIALIZATION ============
+# Hydrate a new session from the prebuilt snapshot instead of starting empty
+if "match_data" not in st.session_state and os.path.isfile(STARTUP_SNAPSHOT):
+    try:
+        snapshot_bytes = read_startup_snapshot(STARTUP_SNAPSHOT, os.stat(STARTUP_SNAPSHOT).st_mtime_ns)
+        startup_state = load_snapshot(io.BytesIO(snapshot_bytes))
+    except (ValueError, KeyError, OSError) as e:
+        st.warning(f"⚠️ Ignoring startup snapshot {STARTUP_SNAPSHOT}: {e}")
+    else:
+        if set(startup_state["team_stats"]) == VALID_TEAMS:
+            apply_restored_state(startup_state)
 if "match_data" not in st.session_state:
-    st.session_state.match_data = []
+    st.session_state.match_data = ColumnarMatchData(empty_columns(), VALID_TEAMS)
 if "home_counters" not in st.session_state:
     st.session_state.home_counters = {team: 0 for team in VALID_TEAMS}
 if "away_counters" not in st.session_state:
@@ -36,110 +110,74 @@ if "match_counter" not in st.session_state:
     st.session_state.match_counter = 1
 if "season_number" not in st.session_state:
     st.session_state.season_number = 1
+if "ranking_history" not in st.session_state:
+    st.session_state.ranking_history = new_ranking_history(st.session_state.team_stats)
+if "rolling_metrics" not in st.session_state:
+    st.session_state.rolling_metrics = new_rolling_metrics(VALID_TEAMS)
+if "season_summaries" not in st.session_state:
+    st.session_state.season_summaries = new_season_summaries()
+if "elo" not in st.session_state:
+    st.session_state.elo = new_elo(VALID_TEAMS)
+if "data_version" not in st.session_state:
+    st.session_state.data_version = 0
 
 # ============ HELPER FUNCTIONS ============
 def reset_league_for_new_season():
     """Reset team statistics for a new season while preserving match history"""
-    # Reset team stats (current season only) - KEEP match_data for CSV exports
-    st.session_state.team_stats = {
-        team: {
-            "P": 0, "W": 0, "D": 0, "L": 0,
-            "GF": 0, "GA": 0, "GD": 0, "Pts": 0, "Form": []
-        }
-        for team in VALID_TEAMS
-    }
-    
-    # Reset counters for new season
-    st.session_state.home_counters = {team: 0 for team in VALID_TEAMS}
-    st.session_state.away_counters = {team: 0 for team in VALID_TEAMS}
-    st.session_state.ha_counters = {team: 0 for team in VALID_TEAMS}
-    st.session_state.status3_counters = {team: 0 for team in VALID_TEAMS}
-    
-    # Increment season number
-    st.session_state.season_number += 1
-    st.session_state.match_counter = 1
+    # Freeze the finished season's summary before its stats are cleared
+    finalize_season(st.session_state.season_summaries, st.session_state.season_number, st.session_state.team_stats)
     
+    # Reset team stats and counters (current season only) - KEEP match_data for CSV exports
+    reset_season(st.session_state)
+    mark_data_changed()
     return True
 
-def check_and_reset_season():
-    """Check if any team has reached 38 matches and reset if needed"""
-    for team in VALID_TEAMS:
-        if st.session_state.team_stats[team]["P"] >= 38:
-            st.warning(f"⚠️ **Season {st.session_state.season_number} Complete!** {team} has played 38 matches. Starting Season {st.session_state.season_number + 1}...")
-            reset_league_for_new_season()
-            return True
-    return False
-
-def calculate_rankings():
-    """Calculate team rankings based on current stats"""
-    sorted_teams = sorted(
-        st.session_state.team_stats.items(),
-        key=lambda x: (x[1]["Pts"], x[1]["GD"], x[1]["GF"]),
-        reverse=True
-    )
-    return sorted_teams
+def mark_data_changed():
+    """Invalidate everything keyed by current_data_version (charts, prepared snapshot)"""
+    st.session_state.data_version += 1
 
-def get_team_position(team_name):
-    """Get current ranking position for a team"""
-    rankings = calculate_rankings()
-    for pos, (team, _) in enumerate(rankings, 1):
-        if team == team_name:
-            return pos
-    return None
+def current_data_version():
+    """Changes whenever matches are added, cleared, reset or restored"""
+    return st.session_state.data_version
 
 def calculate_team_metrics():
     """Calculate detailed metrics for each team"""
-    metrics = {}
-    
-    for team in VALID_TEAMS:
-        stats = st.session_state.team_stats[team]
-        
-        total_matches = stats["P"]
-        win_rate = (stats["W"] / total_matches * 100) if total_matches > 0 else 0
-        draw_rate = (stats["D"] / total_matches * 100) if total_matches > 0 else 0
-        loss_rate = (stats["L"] / total_matches * 100) if total_matches > 0 else 0
-        
-        avg_gf = stats["GF"] / total_matches if total_matches > 0 else 0
-        avg_ga = stats["GA"] / total_matches if total_matches > 0 else 0
-        
-        # Calculate actual Both Teams Scored rate from match data
-        bts_matches = 0
-        for match in st.session_state.match_data:
-            # Check if this team was involved and both teams scored
-            if (match[1] == team and match[2] > 0 and match[3] > 0) or \
-               (match[4] == team and match[2] > 0 and match[3] > 0):
-                bts_matches += 1
-        
-        bts_rate = (bts_matches / total_matches * 100) if total_matches > 0 else 0
-        
-        metrics[team] = {
-            "win_rate": round(win_rate, 1),
-            "draw_rate": round(draw_rate, 1),
-            "loss_rate": round(loss_rate, 1),
-            "avg_gf": round(avg_gf, 2),
-            "avg_ga": round(avg_ga, 2),
-            "bts_rate": round(bts_rate, 1),
-            "form": stats["Form"][-5:] if len(stats["Form"]) >= 5 else stats["Form"],
-            "points_per_game": round(stats["Pts"] / total_matches, 2) if total_matches > 0 else 0,
-        }
-    
-    return metrics
+    teams = list(st.session_state.team_stats)
+    columns = match_columns(st.session_state.match_data, teams)
+    return compute_team_metrics(st.session_state.team_stats, columns, teams)
 
-def predict_match_outcome(home_team, away_team, team_metrics):
-    """Predict match outcome probabilities"""
+def predict_match_outcome(home_team, away_team, team_metrics, home_form=None, away_form=None, elo_ratings=None):
+    """Predict match outcome probabilities
+    
+    home_form/away_form are optional rolling-window metrics (see `window_metrics`);
+    when given they replace the season averages for goals and BTS.
+    elo_ratings is an optional (home_rating, away_rating) pair; when given the
+    win/loss split comes from the Elo expected score instead of season win rates.
+    """
     
     home_metrics = team_metrics[home_team]
     away_metrics = team_metrics[away_team]
+    home_goals = home_form["avg_gf"] if home_form else home_metrics["avg_gf"]
+    away_goals = away_form["avg_gf"] if away_form else away_metrics["avg_gf"]
+    home_bts = home_form["bts_rate"] if home_form else home_metrics["bts_rate"]
+    away_bts = away_form["bts_rate"] if away_form else away_metrics["bts_rate"]
     
-    # Base probabilities from win rates
-    home_win_prob = home_metrics["win_rate"] * (1 - away_metrics["win_rate"] / 100)
-    away_win_prob = away_metrics["win_rate"] * (1 - home_metrics["win_rate"] / 100)
     draw_prob = (home_metrics["draw_rate"] + away_metrics["draw_rate"]) / 2
     
-    # Adjust for home advantage
-    home_advantage = 15  # percentage points
-    home_win_prob += home_advantage
-    away_win_prob = max(0, away_win_prob - home_advantage * 0.5)
+    if elo_ratings:
+        # Elo expected score already includes home advantage
+        expected_home = elo_expected_score(*elo_ratings)
+        home_win_prob = (100 - draw_prob) * expected_home
+        away_win_prob = (100 - draw_prob) * (1 - expected_home)
+    else:
+        # Base probabilities from win rates
+        home_win_prob = home_metrics["win_rate"] * (1 - away_metrics["win_rate"] / 100)
+        away_win_prob = away_metrics["win_rate"] * (1 - home_metrics["win_rate"] / 100)
+        
+        # Adjust for home advantage
+        home_advantage = 15  # percentage points
+        home_win_prob += home_advantage
+        away_win_prob = max(0, away_win_prob - home_advantage * 0.5)
     
     # Normalize to 100%
     total = home_win_prob + away_win_prob + draw_prob
@@ -151,14 +189,14 @@ def predict_match_outcome(home_team, away_team, team_metrics):
         home_win_prob = draw_prob = away_win_prob = 33.3
     
     # Calculate over/under probabilities
-    total_goals_expected = home_metrics["avg_gf"] + away_metrics["avg_gf"]
+    total_goals_expected = home_goals + away_goals
     
     over_2_5_prob = min(90, max(10, (total_goals_expected - 1.5) * 30))
     over_3_5_prob = min(70, max(5, (total_goals_expected - 2.5) * 25))
     over_4_5_prob = min(50, max(2, (total_goals_expected - 3.5) * 20))
     
     # Both teams score probability
-    both_teams_score_prob = (home_metrics["bts_rate"] + away_metrics["bts_rate"]) / 2
+    both_teams_score_prob = (home_bts + away_bts) / 2
     
     # FIX: Ensure all probabilities are within 0-100 range
     home_win_prob = max(0, min(100, home_win_prob))
@@ -178,68 +216,51 @@ def predict_match_outcome(home_team, away_team, team_metrics):
         "over_4_5": round(over_4_5_prob, 1),
         "both_teams_score": round(both_teams_score_prob, 1),
         "expected_goals": round(total_goals_expected, 2),
-        "predicted_score": f"{round(home_metrics['avg_gf'], 1)}-{round(away_metrics['avg_gf'], 1)}"
+        "predicted_score": f"{round(home_goals, 1)}-{round(away_goals, 1)}"
     }
 
+def learned_model():
+    """(model, feature store), built from the stored history the first time the learned predictor is used"""
+    from outcome_model import new_outcome_model, update_model  # scikit-learn is only imported on demand
+    if "outcome_model" not in st.session_state:
+        store = new_feature_store(st.session_state.team_stats)
+        append_matches(store, match_columns(st.session_state.match_data, store["teams"]))
+        model = new_outcome_model()
+        update_model(model, store)
+        st.session_state.feature_store = store
+        st.session_state.outcome_model = model
+    return st.session_state.outcome_model, st.session_state.feature_store
+
+def predict_fixture(home_team, away_team, team_metrics, form_window=None, use_elo=False, use_model=False):
+    """Predict a fixture with the dashboard's optional rolling-form, Elo and learned-model inputs"""
+    return predict_fixtures([home_team], [away_team], team_metrics, form_window, use_elo, use_model)[0]
+
+def predict_fixtures(home_teams, away_teams, team_metrics, form_window=None, use_elo=False, use_model=False):
+    """`predict_fixture` for many fixtures; the learned models score them all in one call each"""
+    predictions = []
+    for home_team, away_team in zip(home_teams, away_teams):
+        home_form = away_form = elo_ratings = None
+        if form_window:
+            home_form = window_metrics(st.session_state.rolling_metrics, home_team, "home", form_window)
+            away_form = window_metrics(st.session_state.rolling_metrics, away_team, "away", form_window)
+        if use_elo:
+            elo_ratings = (team_rating(st.session_state.elo, home_team), team_rating(st.session_state.elo, away_team))
+        predictions.append(predict_match_outcome(home_team, away_team, team_metrics, home_form, away_form, elo_ratings))
+    if use_model and predictions:
+        from outcome_model import model_ready, predict_fixtures_with_model
+        model, store = learned_model()
+        if model_ready(model):
+            # Learned probabilities replace the formula ones; the predicted score stays heuristic
+            learned = predict_fixtures_with_model(model, store, home_teams, away_teams, st.session_state.season_number)
+            for prediction, probabilities in zip(predictions, learned):
+                prediction.update(probabilities)
+    return predictions
+
 def create_head_to_head_stats(home_team, away_team):
     """Calculate head-to-head statistics"""
-    if len(st.session_state.match_data) == 0:
-        return None
-    
-    h2h_matches = []
-    for match in st.session_state.match_data:
-        if (match[1] == home_team and match[4] == away_team) or \
-           (match[1] == away_team and match[4] == home_team):
-            h2h_matches.append(match)
-    
-    if not h2h_matches:
-        return None
-    
-    stats = {
-        "total_matches": len(h2h_matches),
-        "home_wins": 0,
-        "away_wins": 0,
-        "draws": 0,
-        "avg_goals": 0,
-        "over_2_5": 0,
-        "over_3_5": 0,
-        "both_teams_score": 0
-    }
-    
-    total_goals = 0
-    for match in h2h_matches:
-        home_score = match[2]
-        away_score = match[3]
-        total_goals += home_score + away_score
-        
-        if match[1] == home_team:
-            if home_score > away_score:
-                stats["home_wins"] += 1
-            elif away_score > home_score:
-                stats["away_wins"] += 1
-            else:
-                stats["draws"] += 1
-        else:
-            if away_score > home_score:
-                stats["home_wins"] += 1
-            elif home_score > away_score:
-                stats["away_wins"] += 1
-            else:
-                stats["draws"] += 1
-        
-        if home_score + away_score > 2.5:
-            stats["over_2_5"] += 1
-        if home_score + away_score > 3.5:
-            stats["over_3_5"] += 1
-        if home_score > 0 and away_score > 0:
-            stats["both_teams_score"] += 1
-    
-    stats["avg_goals"] = round(total_goals / len(h2h_matches), 2)
-    stats["over_2_5_pct"] = round(stats["over_2_5"] / len(h2h_matches) * 100, 1)
-    stats["over_3_5_pct"] = round(stats["over_3_5"] / len(h2h_matches) * 100, 1)
-    stats["both_teams_score_pct"] = round(stats["both_teams_score"] / len(h2h_matches) * 100, 1)
-    
-    return stats
+    teams = list(st.session_state.team_stats)
+    columns = match_columns(st.session_state.match_data, teams)
+    return head_to_head_stats(columns, teams, home_team, away_team)
 
 def generate_betting_recommendations(home_team, away_team, predictions, team_metrics, h2h_stats):
     """Generate betting recommendations based on analysis"""
@@ -318,32 +339,20 @@ def clean_and_parse_matches(text: str):
     """Clean messy input data and parse matches"""
     lines = [line.strip() for line in text.splitlines() if line.strip()]
     
+    team_index = get_team_index()
+    
     cleaned_lines = []
     for line in lines:
-        skip_patterns = [
-            r'WEEK \d+',
-            r'English League',
-            r'\d{1,2}:\d{2}\s*(?:am|pm)',
-            r'#\d+',
-            r'^\d{8,}$',
-        ]
-        
         is_team = line in VALID_TEAMS
         is_score = line.isdigit() and 0 <= int(line) <= 20
         
         if is_team or is_score:
             cleaned_lines.append(line)
-        else:
-            skip = False
-            for pattern in skip_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    skip = True
-                    break
-            if not skip:
-                for team in VALID_TEAMS:
-                    if team in line:
-                        cleaned_lines.append(team)
-                        break
+        elif not SKIP_LINE_PATTERN.search(line):
+            # Aliases, abbreviations and small typos ("Aston Villa", "Sheff Utd", "Livepool")
+            team = resolve_team(team_index, line)
+            if team:
+                cleaned_lines.append(team)
     
     matches, errors = [], []
     i = 0
@@ -405,9 +414,50 @@ with col2:
     
     with action_col2:
         if st.button("🗑️ Clear All", help="Clear all match data", use_container_width=True):
-            st.session_state.match_data = []
+            st.session_state.match_data = ColumnarMatchData(empty_columns(), st.session_state.team_stats)
+            st.session_state.ranking_history = new_ranking_history(st.session_state.team_stats)
+            st.session_state.rolling_metrics = new_rolling_metrics(VALID_TEAMS)
+            st.session_state.elo = new_elo(VALID_TEAMS)
+            st.session_state.pop("outcome_model", None)
+            st.session_state.pop("feature_store", None)
             reset_league_for_new_season()
+            st.session_state.season_summaries = new_season_summaries()
             st.rerun()
+    
+    # Binary snapshot of the whole state; restoring it skips re-parsing and replay
+    with st.expander("💾 Session Snapshot"):
+        snapshot_version = current_data_version()
+        if len(st.session_state.match_data) > 0:
+            if st.button("📦 Prepare Snapshot", use_container_width=True):
+                buffer = io.BytesIO()
+                save_snapshot(st.session_state, buffer)
+                st.session_state.snapshot_bytes = (snapshot_version, buffer.getvalue())
+            prepared = st.session_state.get("snapshot_bytes")
+            if prepared and prepared[0] == snapshot_version:
+                st.download_button(
+                    label="📥 Download Snapshot",
+                    data=prepared[1],
+                    file_name=f"football_state_season_{st.session_state.season_number}.npz",
+                    mime="application/octet-stream",
+                    use_container_width=True
+                )
+        
+        snapshot_file = st.file_uploader("Restore from snapshot", type=["npz"], key="snapshot_upload")
+        if snapshot_file is not None and st.button("📂 Restore Snapshot", use_container_width=True):
+            try:
+                restored = load_snapshot(snapshot_file)
+            except (ValueError, KeyError, OSError) as e:
+                st.error(f"❌ Could not read snapshot: {e}")
+            else:
+                if set(restored["team_stats"]) != VALID_TEAMS:
+                    st.error("❌ Snapshot was saved with a different set of teams")
+                else:
+                    apply_restored_state(restored)
+                    # Feature store and model are rebuilt from the restored history when next used
+                    st.session_state.pop("outcome_model", None)
+                    st.session_state.pop("feature_store", None)
+                    mark_data_changed()
+                    st.rerun()
 
 # Process input data
 if parse_clicked and raw_input.strip():
@@ -421,127 +471,20 @@ if parse_clicked and raw_input.strip():
             st.write(f"- ... and {len(errors) - 3} more errors")
     
     if new_matches:
-        # Check if we need to reset season before adding new matches
-        needs_reset = False
-        for home_team, home_score, away_score, away_team in new_matches:
-            if st.session_state.team_stats[home_team]["P"] >= 38 or st.session_state.team_stats[away_team]["P"] >= 38:
-                needs_reset = True
-                break
-        
-        if needs_reset:
-            check_and_reset_season()
-        
-        # Process each match
-        processed_count = 0
-        for home_team, home_score, away_score, away_team in new_matches:
-            # Double-check season reset for each match
-            if st.session_state.team_stats[home_team]["P"] >= 38 or st.session_state.team_stats[away_team]["P"] >= 38:
-                check_and_reset_season()
-            
-            match_id = st.session_state.match_counter
-            st.session_state.match_counter += 1
-            
-            total_goals = home_score + away_score
-            
-            # Determine Total-G display
-            if total_goals == 4:
-                total_g_display = "Won"
-            elif total_goals == 3:
-                total_g_display = "3 ✔"
-            else:
-                total_g_display = str(total_goals)
-            
-            # Update counters
-            if total_goals == 4:
-                st.session_state.home_counters[home_team] = 0
-                st.session_state.away_counters[away_team] = 0
-                st.session_state.ha_counters[home_team] = 0
-                st.session_state.ha_counters[away_team] = 0
-            else:
-                st.session_state.home_counters[home_team] += 1
-                st.session_state.away_counters[away_team] += 1
-                st.session_state.ha_counters[home_team] += 1
-                st.session_state.ha_counters[away_team] += 1
-
-            if total_goals == 3:
-                st.session_state.status3_counters[home_team] = 0
-                st.session_state.status3_counters[away_team] = 0
-            else:
-                st.session_state.status3_counters[home_team] += 1
-                st.session_state.status3_counters[away_team] += 1
-            
-            # Update team stats
-            st.session_state.team_stats[home_team]["P"] += 1
-            st.session_state.team_stats[home_team]["GF"] += home_score
-            st.session_state.team_stats[home_team]["GA"] += away_score
-            st.session_state.team_stats[home_team]["GD"] = st.session_state.team_stats[home_team]["GF"] - st.session_state.team_stats[home_team]["GA"]
-            
-            st.session_state.team_stats[away_team]["P"] += 1
-            st.session_state.team_stats[away_team]["GF"] += away_score
-            st.session_state.team_stats[away_team]["GA"] += home_score
-            st.session_state.team_stats[away_team]["GD"] = st.session_state.team_stats[away_team]["GF"] - st.session_state.team_stats[away_team]["GA"]
-            
-            # Update points and results
-            if home_score > away_score:
-                st.session_state.team_stats[home_team]["W"] += 1
-                st.session_state.team_stats[home_team]["Pts"] += 3
-                st.session_state.team_stats[home_team]["Form"].append("W")
-                
-                st.session_state.team_stats[away_team]["L"] += 1
-                st.session_state.team_stats[away_team]["Form"].append("L")
-                
-                result = "Home Win"
-            elif away_score > home_score:
-                st.session_state.team_stats[away_team]["W"] += 1
-                st.session_state.team_stats[away_team]["Pts"] += 3
-                st.session_state.team_stats[away_team]["Form"].append("W")
-                
-                st.session_state.team_stats[home_team]["L"] += 1
-                st.session_state.team_stats[home_team]["Form"].append("L")
-                
-                result = "Away Win"
-            else:
-                st.session_state.team_stats[home_team]["D"] += 1
-                st.session_state.team_stats[home_team]["Pts"] += 1
-                st.session_state.team_stats[home_team]["Form"].append("D")
-                
-                st.session_state.team_stats[away_team]["D"] += 1
-                st.session_state.team_stats[away_team]["Pts"] += 1
-                st.session_state.team_stats[away_team]["Form"].append("D")
-                
-                result = "Draw"
-            
-            # Keep only last 5 form results
-            if len(st.session_state.team_stats[home_team]["Form"]) > 5:
-                st.session_state.team_stats[home_team]["Form"].pop(0)
-            if len(st.session_state.team_stats[away_team]["Form"]) > 5:
-                st.session_state.team_stats[away_team]["Form"].pop(0)
-            
-            # Get current rankings
-            home_rank = get_team_position(home_team)
-            away_rank = get_team_position(away_team)
-            
-            # Add match data with season info
-            st.session_state.match_data.append([
-                match_id, home_team, home_score, away_score, away_team,
-                total_goals, total_g_display, result,
-                home_score - away_score,
-                "Yes" if home_score > 0 and away_score > 0 else "No",
-                "Over 2.5" if total_goals > 2.5 else "Under 2.5",
-                home_rank, away_rank,
-                st.session_state.home_counters[home_team],
-                st.session_state.away_counters[away_team],
-                st.session_state.ha_counters[home_team],
-                st.session_state.ha_counters[away_team],
-                st.session_state.status3_counters[home_team],
-                st.session_state.status3_counters[away_team],
-                f"{home_team}: {st.session_state.ha_counters[home_team]} | {away_team}: {st.session_state.ha_counters[away_team]}",
-                f"{home_team}: {st.session_state.status3_counters[home_team]} | {away_team}: {st.session_state.status3_counters[away_team]}",
-                st.session_state.season_number,  # Season number
-                f"Season {st.session_state.season_number}"  # Season label
-            ])
-            
-            processed_count += 1
+        # Apply the whole paste at once (handles the 38-match season reset)
+        new_rows, resets = ingest_paste(st.session_state, new_matches)
+        for finished_season, team, _ in resets:
+            st.warning(f"⚠️ **Season {finished_season} Complete!** {team} has played {SEASON_LENGTH} matches. Starting Season {finished_season + 1}...")
+        mark_data_changed()
+        if "outcome_model" in st.session_state:
+            # Pre-match features for the new rows, then one incremental training step
+            from outcome_model import update_model
+            append_matches(
+                st.session_state.feature_store,
+                match_columns(new_rows, st.session_state.feature_store["teams"])
+            )
+            update_model(st.session_state.outcome_model, st.session_state.feature_store)
+        processed_count = len(new_rows)
         
         st.success(f"✅ Added {processed_count} matches to Season {st.session_state.season_number}")
         st.rerun()
@@ -551,41 +494,21 @@ if parse_clicked and raw_input.strip():
 # ============ MAIN DASHBOARD SECTIONS ============
 # CORRECTED CONDITION: Check if we have match data
 if len(st.session_state.match_data) > 0:
-    column_names = [
-        "Match_ID", "Home_Team", "Home_Score", "Away_Score", "Away_Team",
-        "Total_Goals", "Total-G", "Match_Result", "Goal_Difference", 
-        "Both_Teams_Scored", "Over_Under", "Home_Rank", "Away_Rank",
-        "Games_Since_Last_Won_Home", "Games_Since_Last_Won_Away",
-        "Games_Since_Last_Won_Combined_Home", "Games_Since_Last_Won_Combined_Away",
-        "Games_Since_Last_3Goals_Home", "Games_Since_Last_3Goals_Away",
-        "F!=4HA", "Status3", "Season_Number", "Season_Label"
-    ]
-    
-    df = pd.DataFrame(st.session_state.match_data, columns=column_names)
-    
     # Create three main columns for the dashboard
     st.markdown("---")
     st.header(f"📊 Season {st.session_state.season_number} Dashboard")
     
+    sections = st.multiselect(
+        "**Show sections**", DASHBOARD_SECTIONS, default=DEFAULT_SECTIONS, key="sections",
+        help="The league table is always shown; other sections are only computed when selected"
+    )
+    
     # Row 1: League Table and Recent Matches
     col_league, col_recent = st.columns([2, 1])
     
     with col_league:
         st.subheader(f"🏆 Season {st.session_state.season_number} League Table")
-        rankings = calculate_rankings()
-        
-        table_data = []
-        for pos, (team, stats) in enumerate(rankings, 1):
-            table_data.append([
-                pos, team, stats["P"], stats["W"], stats["D"], stats["L"],
-                stats["GF"], stats["GA"], stats["GD"], stats["Pts"], 
-                " ".join(stats["Form"][-5:]) if stats["Form"] else "No matches"
-            ])
-        
-        league_df = pd.DataFrame(
-            table_data,
-            columns=["Pos", "Team", "P", "W", "D", "L", "GF", "GA", "GD", "Pts", "Form"]
-        )
+        league_df = league_table(st.session_state.team_stats, st.session_state.elo)
         
         st.dataframe(league_df, use_container_width=True, height=500)
         
@@ -612,289 +535,456 @@ if len(st.session_state.match_data) > 0:
             if len(league_df) > 0:
                 top_scorer = league_df.loc[league_df['Pts'].idxmax()]
                 st.metric("League Leader", top_scorer['Team'], f"{top_scorer['Pts']} Pts")
-    
-    with col_recent:
-        st.subheader("🔄 Recent Match Summary")
         
-        st.markdown("""
-            <div style="background-color:black; color:white; padding:15px; border-radius:10px; border:2px solid #444;">
-        """, unsafe_allow_html=True)
-        
-        # Get recent matches (last 10)
-        recent_matches = st.session_state.match_data[-10:] if len(st.session_state.match_data) > 0 else []
-        
-        for match in recent_matches[::-1]:  # Reverse to show newest first
-            home = match[1]
-            away = match[4]
-            home_score = match[2]
-            away_score = match[3]
-            home_rank = match[11] if len(match) > 11 else "?"
-            away_rank = match[12] if len(match) > 12 else "?"
+        # Table as of an earlier match this season (read from the ranking timeline)
+        st.subheader("🕒 Table History")
+        recorded = season_length_recorded(st.session_state.ranking_history, st.session_state.season_number)
+        if recorded > 1:
+            as_of = st.slider(
+                "Show table as of match", 1, recorded, max(1, recorded - MOVERS_WINDOW), key="table_as_of"
+            )
+            history_col1, history_col2 = st.columns([1, 1])
             
-            # Color code based on result
-            if home_score > away_score:
-                home_style = "color: #4CAF50; font-weight: bold;"
-                away_style = "color: #FF6B6B;"
-            elif away_score > home_score:
-                home_style = "color: #FF6B6B;"
-                away_style = "color: #4CAF50; font-weight: bold;"
-            else:
-                home_style = away_style = "color: #FFD700;"
+            with history_col1:
+                past_table = table_as_of(st.session_state.ranking_history, st.session_state.season_number, as_of)
+                st.dataframe(
+                    pd.DataFrame(past_table, columns=["Pos", "Team"]),
+                    use_container_width=True, hide_index=True, height=300
+                )
             
-            st.markdown(
-                f"<div style='font-size:14px; margin-bottom:8px; padding:5px; border-bottom:1px solid #333;'>"
-                f"<span style='{home_style}'>{home_rank}. {home}</span> "
-                f"{home_score}-{away_score} "
-                f"<span style='{away_style}'>{away} ({away_rank}.)</span>"
-                f"</div>", 
-                unsafe_allow_html=True
-            )
+            with history_col2:
+                st.markdown(f"**Biggest movers since match {as_of}:**")
+                climbers, fallers = biggest_movers(
+                    st.session_state.ranking_history, st.session_state.season_number, as_of, recorded
+                )
+                for team, places, old_pos, new_pos in climbers:
+                    st.write(f"⬆️ {team}: {old_pos} → {new_pos} (+{places})")
+                for team, places, old_pos, new_pos in fallers:
+                    st.write(f"⬇️ {team}: {old_pos} → {new_pos} ({places})")
+                if not climbers and not fallers:
+                    st.info("No position changes")
+        else:
+            st.caption("Table history appears once the season has more than one match")
+    
+    with col_recent:
+        st.subheader("🔄 Recent Match Summary")
         
-        st.markdown("</div>", unsafe_allow_html=True)
+        # One page of the feed, rendered as a single scrollable block (page 1 = newest)
+        total_matches = len(st.session_state.match_data)
+        feed_col1, feed_col2 = st.columns(2)
+        with feed_col1:
+            feed_size = st.selectbox("Matches per page", FEED_PAGE_SIZES, key="feed_size")
+        feed_pages = max(1, -(-total_matches // feed_size))
+        st.session_state.feed_page = min(st.session_state.get("feed_page", 1), feed_pages)
+        with feed_col2:
+            feed_page = st.number_input(f"Page (of {feed_pages})", 1, feed_pages, key="feed_page")
+        feed_start, feed_end = feed_page_bounds(total_matches, feed_size, feed_page)
+        st.markdown(recent_feed_html(st.session_state.match_data[feed_start:feed_end]), unsafe_allow_html=True)
         
         # Quick stats
         st.subheader("📋 Quick Stats")
-        total_matches = len(st.session_state.match_data)
         
-        # Calculate stats for current season only
-        current_season_matches = [m for m in st.session_state.match_data if m[-2] == st.session_state.season_number]
-        current_df = pd.DataFrame(current_season_matches, columns=column_names) if current_season_matches else pd.DataFrame()
+        # Current season stats come from the running season totals
+        current_totals = st.session_state.season_summaries["current"]
         
-        if len(current_df) > 0:
-            avg_goals = current_df["Total_Goals"].mean()
-            home_wins = len(current_df[current_df["Match_Result"] == "Home Win"])
-            away_wins = len(current_df[current_df["Match_Result"] == "Away Win"])
-            draws = len(current_df[current_df["Match_Result"] == "Draw"])
-            
-            st.metric("Season Matches", len(current_season_matches))
-            st.metric("Avg Goals/Match", round(avg_goals, 2))
-            st.metric("Home/Draw/Away", f"{home_wins}/{draws}/{away_wins}")
+        if current_totals["matches"] > 0:
+            st.metric("Season Matches", current_totals["matches"])
+            st.metric("Avg Goals/Match", season_rates(current_totals)["avg_goals"])
+            st.metric("Home/Draw/Away", f"{current_totals['home_wins']}/{current_totals['draws']}/{current_totals['away_wins']}")
         else:
             st.metric("Total Matches", total_matches)
             st.metric("All-time Matches", total_matches)
     
-    # Row 2: Match Predictor
-    st.markdown("---")
-    st.header("🎯 Match Predictor & Analytics")
-    
-    pred_col1, pred_col2 = st.columns(2)
-    
-    with pred_col1:
-        home_team = st.selectbox("**Select Home Team**", sorted(VALID_TEAMS), key="home_select")
-    
-    with pred_col2:
-        away_team = st.selectbox("**Select Away Team**", sorted(VALID_TEAMS), key="away_select")
+    # Predictor settings, left at their defaults when the predictor section is hidden
+    form_window, use_elo, use_model, team_metrics = None, False, False, None
     
-    if home_team == away_team:
-        st.warning("⚠️ Please select two different teams")
-    else:
-        # Calculate predictions
+    # Row 2: Match Predictor
+    if "🎯 Match Predictor" in sections:
+        st.markdown("---")
+        st.header("🎯 Match Predictor & Analytics")
+        
+        pred_col1, pred_col2 = st.columns(2)
+        
+        with pred_col1:
+            home_team = st.selectbox("**Select Home Team**", sorted(VALID_TEAMS), key="home_select")
+        
+        with pred_col2:
+            away_team = st.selectbox("**Select Away Team**", sorted(VALID_TEAMS), key="away_select")
+        
+        # Goals/BTS inputs: whole-season averages or rolling home/away windows
+        form_options = {"Season averages": None}
+        form_options.update({f"Last {window} (home/away)": window for window in WINDOWS})
+        form_options["Time-decayed (home/away)"] = "decay"
+        form_choice = st.selectbox("**Form Window**", list(form_options), key="form_window")
+        form_window = form_options[form_choice]
+        use_elo = st.checkbox("Use Elo ratings for win/draw/loss", key="use_elo")
+        predictor = st.radio(
+            "**Predictor**", ["Heuristic", "Learned model (SGD)"], horizontal=True, key="predictor_backend"
+        )
+        use_model = predictor != "Heuristic"
+        if use_model:
+            from outcome_model import MIN_TRAINING_MATCHES, model_ready
+            if not model_ready(learned_model()[0]):
+                st.info(f"ℹ️ The learned model needs at least {MIN_TRAINING_MATCHES} matches; using the heuristic predictor until then")
+        
         team_metrics = calculate_team_metrics()
-        predictions = predict_match_outcome(home_team, away_team, team_metrics)
-        h2h_stats = create_head_to_head_stats(home_team, away_team)
-        
-        # Display predictions in columns
-        st.subheader("📈 Match Predictions")
-        
-        # Outcome probabilities
-        outcome_col1, outcome_col2, outcome_col3 = st.columns(3)
-        
-        with outcome_col1:
-            st.metric("🏠 Home Win", f"{predictions['home_win']}%")
-            # FIX: Add error handling for progress bar
-            progress_value = min(1.0, max(0.0, predictions['home_win'] / 100))
-            st.progress(progress_value)
-        
-        with outcome_col2:
-            st.metric("🤝 Draw", f"{predictions['draw']}%")
-            # FIX: Add error handling for progress bar
-            progress_value = min(1.0, max(0.0, predictions['draw'] / 100))
-            st.progress(progress_value)
-        
-        with outcome_col3:
-            st.metric("✈️ Away Win", f"{predictions['away_win']}%")
-            # FIX: Add error handling for progress bar
-            progress_value = min(1.0, max(0.0, predictions['away_win'] / 100))
-            st.progress(progress_value)
-        
-        # Goal markets
-        st.subheader("⚽ Goal Markets")
-        goal_col1, goal_col2, goal_col3, goal_col4 = st.columns(4)
-        
-        with goal_col1:
-            st.metric("Over 2.5 Goals", f"{predictions['over_2_5']}%")
-            # FIX: Add error handling for progress bar
-            progress_value = min(1.0, max(0.0, predictions['over_2_5'] / 100))
-            st.progress(progress_value)
-        
-        with goal_col2:
-            st.metric("Over 3.5 Goals", f"{predictions['over_3_5']}%")
-            # FIX: Add error handling for progress bar
-            progress_value = min(1.0, max(0.0, predictions['over_3_5'] / 100))
-            st.progress(progress_value)
-        
-        with goal_col3:
-            st.metric("Over 4.5 Goals", f"{predictions['over_4_5']}%")
-            # FIX: Add error handling for progress bar
-            progress_value = min(1.0, max(0.0, predictions['over_4_5'] / 100))
-            st.progress(progress_value)
-        
-        with goal_col4:
-            st.metric("Both Teams Score", f"{predictions['both_teams_score']}%")
-            # FIX: Add error handling for progress bar
-            progress_value = min(1.0, max(0.0, predictions['both_teams_score'] / 100))
-            st.progress(progress_value)
-        
-        # Expected goals
-        col_exp1, col_exp2 = st.columns(2)
-        with col_exp1:
-            st.metric("📊 Expected Total Goals", predictions['expected_goals'])
-        with col_exp2:
-            st.metric("🔮 Predicted Score", predictions['predicted_score'])
-        
-        # Head-to-head statistics
-        if h2h_stats:
-            st.subheader("🤼 Head-to-Head History")
-            h2h_col1, h2h_col2, h2h_col3, h2h_col4 = st.columns(4)
+        
+        if home_team == away_team:
+            st.warning("⚠️ Please select two different teams")
+        else:
+            # Calculate predictions
+            predictions = predict_fixture(home_team, away_team, team_metrics, form_window, use_elo, use_model)
+            home_elo = team_rating(st.session_state.elo, home_team)
+            away_elo = team_rating(st.session_state.elo, away_team)
+            h2h_stats = create_head_to_head_stats(home_team, away_team)
             
-            with h2h_col1:
-                st.metric("Matches Played", h2h_stats["total_matches"])
+            # Display predictions in columns
+            st.subheader("📈 Match Predictions")
             
-            with h2h_col2:
-                st.metric(f"{home_team} Wins", h2h_stats["home_wins"])
+            # Outcome probabilities
+            outcome_col1, outcome_col2, outcome_col3 = st.columns(3)
             
-            with h2h_col3:
-                st.metric(f"{away_team} Wins", h2h_stats["away_wins"])
+            with outcome_col1:
+                st.metric("🏠 Home Win", f"{predictions['home_win']}%")
+                # FIX: Add error handling for progress bar
+                progress_value = min(1.0, max(0.0, predictions['home_win'] / 100))
+                st.progress(progress_value)
             
-            with h2h_col4:
-                st.metric("Draws", h2h_stats["draws"])
+            with outcome_col2:
+                st.metric("🤝 Draw", f"{predictions['draw']}%")
+                # FIX: Add error handling for progress bar
+                progress_value = min(1.0, max(0.0, predictions['draw'] / 100))
+                st.progress(progress_value)
             
-            # Historical trends
-            st.markdown("**📊 Historical Trends:**")
-            trend_col1, trend_col2, trend_col3 = st.columns(3)
+            with outcome_col3:
+                st.metric("✈️ Away Win", f"{predictions['away_win']}%")
+                # FIX: Add error handling for progress bar
+                progress_value = min(1.0, max(0.0, predictions['away_win'] / 100))
+                st.progress(progress_value)
             
-            with trend_col1:
-                st.metric("Over 2.5 Goals", f"{h2h_stats['over_2_5_pct']}%")
+            # Goal markets
+            st.subheader("⚽ Goal Markets")
+            goal_col1, goal_col2, goal_col3, goal_col4 = st.columns(4)
             
-            with trend_col2:
-                st.metric("Over 3.5 Goals", f"{h2h_stats['over_3_5_pct']}%")
+            with goal_col1:
+                st.metric("Over 2.5 Goals", f"{predictions['over_2_5']}%")
+                # FIX: Add error handling for progress bar
+                progress_value = min(1.0, max(0.0, predictions['over_2_5'] / 100))
+                st.progress(progress_value)
             
-            with trend_col3:
-                st.metric("Both Teams Scored", f"{h2h_stats['both_teams_score_pct']}%")
+            with goal_col2:
+                st.metric("Over 3.5 Goals", f"{predictions['over_3_5']}%")
+                # FIX: Add error handling for progress bar
+                progress_value = min(1.0, max(0.0, predictions['over_3_5'] / 100))
+                st.progress(progress_value)
             
-            st.caption(f"Average Goals per Match: {h2h_stats['avg_goals']}")
-        else:
-            st.info("📊 No head-to-head history available for these teams")
-        
-        # Betting Recommendations
+            with goal_col3:
+                st.metric("Over 4.5 Goals", f"{predictions['over_4_5']}%")
+                # FIX: Add error handling for progress bar
+                progress_value = min(1.0, max(0.0, predictions['over_4_5'] / 100))
+                st.progress(progress_value)
+            
+            with goal_col4:
+                st.metric("Both Teams Score", f"{predictions['both_teams_score']}%")
+                # FIX: Add error handling for progress bar
+                progress_value = min(1.0, max(0.0, predictions['both_teams_score'] / 100))
+                st.progress(progress_value)
+            
+            # Expected goals
+            col_exp1, col_exp2 = st.columns(2)
+            with col_exp1:
+                st.metric("📊 Expected Total Goals", predictions['expected_goals'])
+            with col_exp2:
+                st.metric("🔮 Predicted Score", predictions['predicted_score'])
+            
+            # Head-to-head statistics
+            if h2h_stats:
+                st.subheader("🤼 Head-to-Head History")
+                h2h_col1, h2h_col2, h2h_col3, h2h_col4 = st.columns(4)
+                
+                with h2h_col1:
+                    st.metric("Matches Played", h2h_stats["total_matches"])
+                
+                with h2h_col2:
+                    st.metric(f"{home_team} Wins", h2h_stats["home_wins"])
+                
+                with h2h_col3:
+                    st.metric(f"{away_team} Wins", h2h_stats["away_wins"])
+                
+                with h2h_col4:
+                    st.metric("Draws", h2h_stats["draws"])
+                
+                # Historical trends
+                st.markdown("**📊 Historical Trends:**")
+                trend_col1, trend_col2, trend_col3 = st.columns(3)
+                
+                with trend_col1:
+                    st.metric("Over 2.5 Goals", f"{h2h_stats['over_2_5_pct']}%")
+                
+                with trend_col2:
+                    st.metric("Over 3.5 Goals", f"{h2h_stats['over_3_5_pct']}%")
+                
+                with trend_col3:
+                    st.metric("Both Teams Scored", f"{h2h_stats['both_teams_score_pct']}%")
+                
+                st.caption(f"Average Goals per Match: {h2h_stats['avg_goals']}")
+            else:
+                st.info("📊 No head-to-head history available for these teams")
+            
+            # Betting Recommendations
+            st.markdown("---")
+            st.subheader("💰 Betting Recommendations")
+            
+            recommendations = generate_betting_recommendations(
+                home_team, away_team, predictions, team_metrics, h2h_stats
+            )
+            
+            # Display recommendations in columns
+            rec_col1, rec_col2 = st.columns(2)
+            
+            with rec_col1:
+                if recommendations["best_bets"]:
+                    st.markdown("#### ✅ **BEST BETS:**")
+                    for bet, reason in recommendations["best_bets"]:
+                        with st.expander(f"**{bet}**", expanded=False):
+                            st.write(f"**Why:** {reason}")
+                else:
+                    st.info("No strong betting recommendations available")
+            
+            with rec_col2:
+                if recommendations["avoid_bets"]:
+                    st.markdown("#### ❌ **AVOID:**")
+                    for bet in recommendations["avoid_bets"]:
+                        st.write(f"- {bet}")
+                else:
+                    st.info("No specific bets to avoid")
+            
+            # Key Insights
+            if recommendations["insights"]:
+                st.markdown("#### 📊 **KEY INSIGHTS:**")
+                for insight in recommendations["insights"]:
+                    st.write(f"• {insight}")
+            
+            # Team Comparison
+            st.markdown("---")
+            st.subheader("📋 Team Comparison")
+            
+            compare_data = {
+                "Metric": ["Win Rate", "Draw Rate", "Loss Rate", "Avg Goals For", 
+                          "Avg Goals Against", "Points per Game", "Current Form", "Elo Rating"],
+                home_team: [
+                    f"{team_metrics[home_team]['win_rate']}%",
+                    f"{team_metrics[home_team]['draw_rate']}%",
+                    f"{team_metrics[home_team]['loss_rate']}%",
+                    team_metrics[home_team]['avg_gf'],
+                    team_metrics[home_team]['avg_ga'],
+                    team_metrics[home_team]['points_per_game'],
+                    " ".join(team_metrics[home_team]['form']) if team_metrics[home_team]['form'] else "No form",
+                    round(home_elo)
+                ],
+                away_team: [
+                    f"{team_metrics[away_team]['win_rate']}%",
+                    f"{team_metrics[away_team]['draw_rate']}%",
+                    f"{team_metrics[away_team]['loss_rate']}%",
+                    team_metrics[away_team]['avg_gf'],
+                    team_metrics[away_team]['avg_ga'],
+                    team_metrics[away_team]['points_per_game'],
+                    " ".join(team_metrics[away_team]['form']) if team_metrics[away_team]['form'] else "No form",
+                    round(away_elo)
+                ]
+            }
+            
+            compare_df = pd.DataFrame(compare_data)
+            st.dataframe(compare_df, use_container_width=True, hide_index=True)
+            
+            if form_window:
+                st.markdown(f"**📉 {form_choice} Form:**")
+                home_form = window_metrics(st.session_state.rolling_metrics, home_team, "home", form_window)
+                away_form = window_metrics(st.session_state.rolling_metrics, away_team, "away", form_window)
+                form_rows = []
+                for label, form in ((f"{home_team} (home)", home_form), (f"{away_team} (away)", away_form)):
+                    if form:
+                        form_rows.append([label, form["matches"], form["avg_gf"], form["avg_ga"],
+                                          f"{form['bts_rate']}%", f"{form['over_2_5_rate']}%", f"{form['over_3_5_rate']}%"])
+                    else:
+                        form_rows.append([label, 0, None, None, None, None, None])
+                st.dataframe(
+                    pd.DataFrame(form_rows, columns=["Team", "Matches", "Avg GF", "Avg GA", "BTS", "Over 2.5", "Over 3.5"]),
+                    use_container_width=True, hide_index=True
+                )
+    
+    # Row 3: Value Bet Scanner (model probabilities vs local odds snapshots)
+    if "💹 Value Bets" in sections:
         st.markdown("---")
-        st.subheader("💰 Betting Recommendations")
-        
-        recommendations = generate_betting_recommendations(
-            home_team, away_team, predictions, team_metrics, h2h_stats
+        st.header("💹 Value Bet Scanner")
+        st.caption(
+            "Odds files (CSV or JSON): one row per fixture with `home_team`, `away_team` and decimal odds for any of: "
+            + ", ".join(f"`{market}`" for market in MARKETS)
         )
         
-        # Display recommendations in columns
-        rec_col1, rec_col2 = st.columns(2)
+        odds_col1, odds_col2 = st.columns([2, 1])
+        with odds_col1:
+            odds_uploads = st.file_uploader(
+                "Upload odds snapshots (oldest first)", type=["csv", "json"],
+                accept_multiple_files=True, key="odds_uploads"
+            )
+        with odds_col2:
+            odds_folder = st.text_input("...or read snapshots from folder", value="odds", key="odds_folder")
+            min_edge = st.slider("Minimum edge (EV %)", 0.0, 50.0, 2.0, 0.5, key="min_edge")
         
-        with rec_col1:
-            if recommendations["best_bets"]:
-                st.markdown("#### ✅ **BEST BETS:**")
-                for bet, reason in recommendations["best_bets"]:
-                    with st.expander(f"**{bet}**", expanded=False):
-                        st.write(f"**Why:** {reason}")
-            else:
-                st.info("No strong betting recommendations available")
+        if "odds_cache" not in st.session_state:
+            st.session_state.odds_cache = {}
+        # Feed spellings ("Man City", "Aston Villa") resolve like pasted team lines
+        resolve = partial(resolve_team, get_team_index())
+        # An unreadable file is skipped and reported; the board is built from the rest
+        folder_odds, skipped = load_odds_folder(odds_folder, st.session_state.odds_cache, resolve)
+        snapshots = []
+        for upload in odds_uploads or []:
+            try:
+                snapshots.append(read_odds_file(upload, upload.name, resolve))
+            except ValueError as error:
+                skipped.append((upload.name, str(error)))
+        for name, error in skipped:
+            st.warning(f"⚠️ Skipped odds file {name}: {error}")
+        odds = combine_snapshots([folder_odds] + snapshots if len(folder_odds) else snapshots)
         
-        with rec_col2:
-            if recommendations["avoid_bets"]:
-                st.markdown("#### ❌ **AVOID:**")
-                for bet in recommendations["avoid_bets"]:
-                    st.write(f"- {bet}")
+        if len(odds) > 0:
+            known = odds["home_team"].isin(VALID_TEAMS) & odds["away_team"].isin(VALID_TEAMS) & (odds["home_team"] != odds["away_team"])
+            if not known.all():
+                st.warning(f"⚠️ Skipped {int((~known).sum())} fixtures with unknown team names")
+            odds = odds[known].reset_index(drop=True)
+            
+            settings = "the predictor settings above" if team_metrics is not None else "the default predictor"
+            if team_metrics is None:
+                team_metrics = calculate_team_metrics()
+            fixture_predictions = predict_fixtures(
+                list(odds["home_team"]), list(odds["away_team"]), team_metrics, form_window, use_elo, use_model
+            )
+            board = value_bet_board(odds, model_probabilities(fixture_predictions), min_edge / 100)
+            st.caption(f"{len(odds)} fixtures × {len(MARKETS)} markets scanned using {settings}")
+            if len(board) > 0:
+                st.dataframe(board, use_container_width=True, hide_index=True)
             else:
-                st.info("No specific bets to avoid")
+                st.info("No bets above the minimum edge")
+        else:
+            st.info("📂 No odds loaded yet")
+    
+    # Row 4: Charts (aggregated and downsampled server-side, rebuilt only when the data changes)
+    if "📉 Charts" in sections:
+        from charts import home_away_figure, progression_figures, trend_figure  # plotly is only imported when shown
+        st.markdown("---")
+        st.header("📉 Charts")
         
-        # Key Insights
-        if recommendations["insights"]:
-            st.markdown("#### 📊 **KEY INSIGHTS:**")
-            for insight in recommendations["insights"]:
-                st.write(f"• {insight}")
+        chart_cache = st.session_state.get("chart_cache")
+        if chart_cache is None or chart_cache["version"] != current_data_version():
+            chart_team_order = list(st.session_state.team_stats)
+            chart_cache = st.session_state.chart_cache = {
+                "version": current_data_version(),
+                "teams": chart_team_order,
+                "columns": match_columns(st.session_state.match_data, chart_team_order),
+                "figures": {},
+            }
+        chart_figures = chart_cache["figures"]
         
-        # Team Comparison
-        st.markdown("---")
-        st.subheader("📋 Team Comparison")
-        
-        compare_data = {
-            "Metric": ["Win Rate", "Draw Rate", "Loss Rate", "Avg Goals For", 
-                      "Avg Goals Against", "Points per Game", "Current Form"],
-            home_team: [
-                f"{team_metrics[home_team]['win_rate']}%",
-                f"{team_metrics[home_team]['draw_rate']}%",
-                f"{team_metrics[home_team]['loss_rate']}%",
-                team_metrics[home_team]['avg_gf'],
-                team_metrics[home_team]['avg_ga'],
-                team_metrics[home_team]['points_per_game'],
-                " ".join(team_metrics[home_team]['form']) if team_metrics[home_team]['form'] else "No form"
-            ],
-            away_team: [
-                f"{team_metrics[away_team]['win_rate']}%",
-                f"{team_metrics[away_team]['draw_rate']}%",
-                f"{team_metrics[away_team]['loss_rate']}%",
-                team_metrics[away_team]['avg_gf'],
-                team_metrics[away_team]['avg_ga'],
-                team_metrics[away_team]['points_per_game'],
-                " ".join(team_metrics[away_team]['form']) if team_metrics[away_team]['form'] else "No form"
-            ]
-        }
+        chart_teams = st.multiselect(
+            "**Teams to chart**",
+            sorted(VALID_TEAMS),
+            default=league_df["Team"][:3].tolist(),
+            max_selections=6,
+            key="chart_teams"
+        )
+        progression_key = ("progression", tuple(chart_teams))
+        if progression_key not in chart_figures:
+            chart_figures[progression_key] = progression_figures(
+                chart_cache["columns"], chart_cache["teams"], st.session_state.ranking_history, chart_teams
+            )
+        if "trend" not in chart_figures:
+            chart_figures["trend"] = trend_figure(chart_cache["columns"])
+        if "home_away" not in chart_figures:
+            chart_figures["home_away"] = home_away_figure(
+                chart_cache["columns"], chart_cache["teams"], st.session_state.season_number
+            )
         
-        compare_df = pd.DataFrame(compare_data)
-        st.dataframe(compare_df, use_container_width=True, hide_index=True)
-    
-    # Row 3: Data Export and Management
-    st.markdown("---")
-    st.header("💾 Data Management & Export")
-    
-    exp_col1, exp_col2, exp_col3 = st.columns(3)
-    
-    with exp_col1:
-        # Export ALL match data (all seasons)
-        csv_full = df.to_csv(index=False)
-        st.download_button(
-            "📋 Download ALL Match Data",
-            data=csv_full,
-            file_name=f"football_data_all_seasons.csv",
-            mime="text/csv",
-            help="Includes ALL matches from ALL seasons",
-            use_container_width=True
+        points_tab, position_tab, trend_tab, split_tab = st.tabs(
+            ["Points Progression", "Position Progression", "Goals & BTS Trend", "Home/Away Splits"]
         )
+        with points_tab:
+            st.plotly_chart(chart_figures[progression_key][0], use_container_width=True)
+        with position_tab:
+            st.plotly_chart(chart_figures[progression_key][1], use_container_width=True)
+        with trend_tab:
+            st.plotly_chart(chart_figures["trend"], use_container_width=True)
+        with split_tab:
+            st.plotly_chart(chart_figures["home_away"], use_container_width=True)
+    
+    # Row 5: Season Comparison (finalized season summaries only)
+    if "📚 Season Comparison" in sections:
+        season_comparison = compare_seasons(st.session_state.season_summaries)
+        if season_comparison:
+            st.markdown("---")
+            st.header("📚 Season Comparison")
+            st.dataframe(pd.DataFrame(season_comparison), use_container_width=True, hide_index=True)
+            
+            past_season = st.selectbox(
+                "**Final standings for season**",
+                [row["Season"] for row in reversed(season_comparison)],
+                key="past_season_select"
+            )
+            st.dataframe(
+                pd.DataFrame(
+                    st.session_state.season_summaries["seasons"][past_season]["standings"],
+                    columns=["Pos", "Team", "P", "W", "D", "L", "GF", "GA", "GD", "Pts"]
+                ),
+                use_container_width=True, hide_index=True
+            )
     
-    with exp_col2:
-        # Export current season data only
-        current_season_df = df[df["Season_Number"] == st.session_state.season_number]
-        if len(current_season_df) > 0:
-            csv_current = current_season_df.to_csv(index=False)
+    # Row 6: Data Export and Management
+    if "💾 Export" in sections:
+        st.markdown("---")
+        st.header("💾 Data Management & Export")
+        
+        df = pd.DataFrame(list(st.session_state.match_data), columns=MATCH_COLUMNS)
+        exp_col1, exp_col2, exp_col3 = st.columns(3)
+        
+        with exp_col1:
+            # Export ALL match data (all seasons)
+            csv_full = df.to_csv(index=False)
             st.download_button(
-                f"🏆 Download Season {st.session_state.season_number} Data",
-                data=csv_current,
-                file_name=f"season_{st.session_state.season_number}_matches.csv",
+                "📋 Download ALL Match Data",
+                data=csv_full,
+                file_name=f"football_data_all_seasons.csv",
                 mime="text/csv",
-                help=f"Matches from Season {st.session_state.season_number} only",
+                help="Includes ALL matches from ALL seasons",
+                use_container_width=True
+            )
+        
+        with exp_col2:
+            # Export current season data only
+            current_season_df = df[df["Season_Number"] == st.session_state.season_number]
+            if len(current_season_df) > 0:
+                csv_current = current_season_df.to_csv(index=False)
+                st.download_button(
+                    f"🏆 Download Season {st.session_state.season_number} Data",
+                    data=csv_current,
+                    file_name=f"season_{st.session_state.season_number}_matches.csv",
+                    mime="text/csv",
+                    help=f"Matches from Season {st.session_state.season_number} only",
+                    use_container_width=True
+                )
+            else:
+                st.info("No matches in current season")
+        
+        with exp_col3:
+            # Export league table
+            csv_league = league_df.to_csv(index=False)
+            st.download_button(
+                "📊 Download League Table",
+                data=csv_league,
+                file_name=f"season_{st.session_state.season_number}_league_table.csv",
+                mime="text/csv",
+                help="Current league standings",
                 use_container_width=True
             )
-        else:
-            st.info("No matches in current season")
-    
-    with exp_col3:
-        # Export league table
-        csv_league = league_df.to_csv(index=False)
-        st.download_button(
-            "📊 Download League Table",
-            data=csv_league,
-            file_name=f"season_{st.session_state.season_number}_league_table.csv",
-            mime="text/csv",
-            help="Current league standings",
-            use_container_width=True
-        )
     
     # Season reset warning
     max_played = max([st.session_state.team_stats[team]["P"] for team in VALID_TEAMS]) if st.session_state.team_stats else 0
@@ -904,7 +994,7 @@ if len(st.session_state.match_data) > 0:
     
     # Show match count
     total_all_time = len(st.session_state.match_data)
-    current_season_count = len([m for m in st.session_state.match_data if m[-2] == st.session_state.season_number])
+    current_season_count = st.session_state.season_summaries["current"]["matches"]
     
     st.info(f"📈 **Data Summary**: {total_all_time} total matches | {current_season_count} in Season {st.session_state.season_number}")
 
@@ -966,3 +1056,17 @@ st.markdown(
     "</div>",
     unsafe_allow_html=True
 )
+
+# Render timing: the first full run of a session is its time-to-first-render
+run_ms = (time.perf_counter() - RUN_START) * 1000
+if "first_render_ms" not in st.session_state:
+    st.session_state.first_render_ms = run_ms
+    timings = render_timings()
+    timings.append(run_ms)
+    del timings[:-1000]
+recent_first_renders = sorted(render_timings())
+st.caption(
+    f"⏱️ First render {st.session_state.first_render_ms:.0f} ms • this run {run_ms:.0f} ms • "
+    f"median first render {recent_first_renders[len(recent_first_renders) // 2]:.0f} ms "
+    f"over {len(recent_first_renders)} sessions"
+)
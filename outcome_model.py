@@ -0,0 +1,84 @@
+"""Learned predictor backend trained incrementally on the feature store.
+
+Three scikit-learn SGD logistic models share one incrementally fitted scaler:
+match outcome (home/draw/away), total goals (0..6+, which gives every
+over/under line) and both-teams-score. Each ingest batch is fed through
+`partial_fit`; nothing is ever retrained from scratch.
+"""
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from feature_store import MAX_GOALS_CLASS, fixtures_features
+
+OUTCOME_CLASSES = np.array([0, 1, 2])  # home win, draw, away win
+GOAL_CLASSES = np.arange(MAX_GOALS_CLASS + 1)
+BTS_CLASSES = np.array([0, 1])
+MIN_TRAINING_MATCHES = 50  # below this the dashboard keeps the heuristic predictor
+TRAIN_CHUNK = 20_000
+
+
+def _classifier():
+    # Small, slowly decaying steps keep early probabilities close to the base rates
+    return SGDClassifier(
+        loss="log_loss", learning_rate="invscaling", eta0=0.05, power_t=0.25, alpha=1e-4, random_state=0
+    )
+
+
+def new_outcome_model():
+    """Untrained models; `trained` counts feature-store rows consumed so far"""
+    return {
+        "scaler": StandardScaler(),
+        "outcome": _classifier(),
+        "goals": _classifier(),
+        "bts": _classifier(),
+        "trained": 0,
+    }
+
+
+def update_model(model, store):
+    """partial_fit on every feature-store row the model has not seen yet"""
+    total = len(store["features"])
+    for start in range(model["trained"], total, TRAIN_CHUNK):
+        end = min(start + TRAIN_CHUNK, total)
+        features = store["features"][start:end]
+        model["scaler"].partial_fit(features)
+        scaled = model["scaler"].transform(features)
+        model["outcome"].partial_fit(scaled, store["outcome"][start:end], classes=OUTCOME_CLASSES)
+        model["goals"].partial_fit(scaled, store["goals"][start:end], classes=GOAL_CLASSES)
+        model["bts"].partial_fit(scaled, store["bts"][start:end], classes=BTS_CLASSES)
+        model["trained"] = end
+
+
+def model_ready(model):
+    return model["trained"] >= MIN_TRAINING_MATCHES
+
+
+def predict_with_model(model, store, home_team, away_team, season_number):
+    """Probabilities (percent) in the same keys as predict_match_outcome"""
+    return predict_fixtures_with_model(model, store, [home_team], [away_team], season_number)[0]
+
+
+def predict_fixtures_with_model(model, store, home_teams, away_teams, season_number):
+    """`predict_with_model` for many fixtures with one predict_proba call per model"""
+    if not len(home_teams):
+        return []
+    scaled = model["scaler"].transform(fixtures_features(store, home_teams, away_teams, season_number))
+    outcome = model["outcome"].predict_proba(scaled)
+    goals = model["goals"].predict_proba(scaled)
+    both_score = model["bts"].predict_proba(scaled)[:, 1]
+    over = [goals[:, line:].sum(axis=1) for line in (3, 4, 5)]
+    expected = goals @ GOAL_CLASSES
+    return [
+        {
+            "home_win": round(outcome[i, 0] * 100, 1),
+            "away_win": round(outcome[i, 2] * 100, 1),
+            "draw": round(outcome[i, 1] * 100, 1),
+            "over_2_5": round(over[0][i] * 100, 1),
+            "over_3_5": round(over[1][i] * 100, 1),
+            "over_4_5": round(over[2][i] * 100, 1),
+            "both_teams_score": round(both_score[i] * 100, 1),
+            "expected_goals": round(float(expected[i]), 2),
+        }
+        for i in range(len(scaled))
+    ]
@@ -0,0 +1,71 @@
+"""Compact per-season ranking timeline.
+
+For every season we keep an int8 matrix of league positions with one row per
+match (row k = table after the season's (k+1)th match) and one column per team.
+A season is at most a few hundred rows, so "table as of match N", position
+trajectories and biggest movers are all simple row/column reads.
+"""
+import numpy as np
+
+
+def new_ranking_history(teams):
+    """Empty timeline; column order follows `teams`"""
+    return {"teams": list(teams), "seasons": {}}
+
+
+def record_positions(history, season_number, positions):
+    """Append position rows (matches x teams) to a season's timeline"""
+    positions = np.asarray(positions, dtype=np.int8)
+    existing = history["seasons"].get(season_number)
+    if existing is None:
+        history["seasons"][season_number] = positions.copy()
+    else:
+        history["seasons"][season_number] = np.concatenate([existing, positions])
+
+
+def season_length_recorded(history, season_number):
+    """Number of matches recorded for a season"""
+    positions = history["seasons"].get(season_number)
+    return 0 if positions is None else len(positions)
+
+
+def table_as_of(history, season_number, match_number):
+    """Teams in table order after match `match_number` (1-based) of a season"""
+    positions = history["seasons"].get(season_number)
+    if positions is None or not 1 <= match_number <= len(positions):
+        return []
+    row = positions[match_number - 1]
+    order = np.argsort(row, kind="stable")
+    return [(int(row[i]), history["teams"][i]) for i in order]
+
+
+def position_trajectory(history, season_number, team):
+    """Position of `team` after every match of a season"""
+    positions = history["seasons"].get(season_number)
+    if positions is None:
+        return []
+    return positions[:, history["teams"].index(team)].tolist()
+
+
+def biggest_movers(history, season_number, from_match, to_match, top=3):
+    """Teams that climbed and dropped the most between two matches of a season.
+
+    Returns (climbers, fallers) as lists of (team, places, old_pos, new_pos).
+    `from_match` may be 0 to compare against the first recorded table.
+    """
+    positions = history["seasons"].get(season_number)
+    if positions is None or len(positions) == 0:
+        return [], []
+    last = len(positions)
+    before = positions[min(max(from_match, 1), last) - 1].astype(np.int16)
+    after = positions[min(max(to_match, 1), last) - 1].astype(np.int16)
+    change = before - after  # positive = climbed
+    order = np.argsort(-change, kind="stable")
+    teams = history["teams"]
+
+    def mover(i):
+        return teams[i], int(change[i]), int(before[i]), int(after[i])
+
+    climbers = [mover(i) for i in order[:top] if change[i] > 0]
+    fallers = [mover(i) for i in order[::-1][:top] if change[i] < 0]
+    return climbers, fallers
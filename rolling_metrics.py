@@ -0,0 +1,108 @@
+"""Rolling-window and time-decayed team metrics.
+
+Every (venue, team) pair owns a fixed-size ring buffer holding its most recent
+match values, plus exponentially decayed running sums. Both are updated in one
+vectorized pass per ingested batch and carry across season resets, so reading
+any window for a team is O(1).
+"""
+import numpy as np
+
+from match_store import match_columns
+
+WINDOWS = (5, 10, 20)
+DECAY_HALF_LIFE = 10  # matches until a result counts half as much
+VENUES = ("home", "away", "all")
+METRICS = ("gf", "ga", "bts", "over_2_5", "over_3_5")
+
+
+def new_rolling_metrics(teams, capacity=max(WINDOWS)):
+    """Empty ring buffers and decayed sums for every venue/team pair"""
+    teams = list(teams)
+    groups = len(VENUES) * len(teams)
+    return {
+        "teams": teams,
+        "index": {team: i for i, team in enumerate(teams)},
+        "buffer": np.zeros((groups, capacity, len(METRICS))),
+        "count": np.zeros(groups, dtype=np.int64),
+        "window_sums": np.zeros((len(WINDOWS), groups, len(METRICS))),
+        "decayed": np.zeros((groups, len(METRICS))),
+        "decay_weight": np.zeros(groups),
+    }
+
+
+def _push(rolling, groups, values):
+    """Append time-ordered values to their groups' ring buffers and decayed sums"""
+    buffer, count = rolling["buffer"], rolling["count"]
+    capacity = buffer.shape[1]
+    order = np.argsort(groups, kind="stable")
+    groups_sorted, values_sorted = groups[order], values[order]
+    group_start = np.searchsorted(groups_sorted, groups_sorted, side="left")
+    n_new = np.searchsorted(groups_sorted, groups_sorted, side="right") - group_start
+    rank = np.arange(len(groups_sorted)) - group_start
+
+    # Only the newest `capacity` values per group survive, so writes never collide
+    keep = rank >= n_new - capacity
+    slots = (count[groups_sorted] + rank) % capacity
+    buffer[groups_sorted[keep], slots[keep]] = values_sorted[keep]
+
+    alpha = 0.5 ** (1 / DECAY_HALF_LIFE)
+    added = np.bincount(groups_sorted, minlength=len(count))
+    weights = alpha ** (n_new - 1 - rank)
+    fade = alpha ** added
+    rolling["decayed"] *= fade[:, None]
+    for m in range(len(METRICS)):
+        rolling["decayed"][:, m] += np.bincount(groups_sorted, values_sorted[:, m] * weights, len(count))
+    rolling["decay_weight"] = rolling["decay_weight"] * fade + np.bincount(groups_sorted, weights, len(count))
+    count += added
+
+    # Window sums are re-read from the ring for touched groups (exact, no float drift)
+    touched = np.flatnonzero(added)
+    for w, window in enumerate(WINDOWS):
+        back = count[touched][:, None] - 1 - np.arange(window)[None, :]
+        recent = buffer[touched[:, None], back % capacity] * (back >= 0)[..., None]
+        rolling["window_sums"][w, touched] = recent.sum(axis=1)
+
+
+def update_rolling_metrics(rolling, batch):
+    """Feed newly stored matches (the ColumnarMatchData from ingest) in time order"""
+    if len(batch) == 0:
+        return
+    n_teams = len(rolling["teams"])
+    columns = match_columns(batch, rolling["teams"])
+    home = columns["home"].astype(np.int64)
+    away = columns["away"].astype(np.int64)
+    home_score = columns["home_score"].astype(np.float64)
+    away_score = columns["away_score"].astype(np.float64)
+    total = home_score + away_score
+    bts = (home_score > 0) & (away_score > 0)
+    home_values = np.column_stack([home_score, away_score, bts, total > 2.5, total > 3.5])
+    away_values = np.column_stack([away_score, home_score, bts, total > 2.5, total > 3.5])
+
+    # Per match: home side at home, away side away, then both sides overall
+    groups = np.column_stack([home, n_teams + away, 2 * n_teams + home, 2 * n_teams + away]).ravel()
+    values = np.stack([home_values, away_values, home_values, away_values], axis=1).reshape(-1, len(METRICS))
+    _push(rolling, groups, values)
+
+
+def window_metrics(rolling, team, venue="all", window=5):
+    """Averages for a team's last `window` matches at a venue, or "decay" for
+    the exponentially weighted version. Returns None when there is no data."""
+    group = VENUES.index(venue) * len(rolling["teams"]) + rolling["index"][team]
+    played = int(rolling["count"][group])
+    if window == "decay":
+        totals, weight = rolling["decayed"][group], rolling["decay_weight"][group]
+    else:
+        played = min(played, window)
+        totals, weight = rolling["window_sums"][WINDOWS.index(window), group], played
+    if weight == 0:
+        return None
+
+    averages = totals / weight
+    return {
+        "matches": played,
+        "avg_gf": round(float(averages[0]), 2),
+        "avg_ga": round(float(averages[1]), 2),
+        "bts_rate": round(float(averages[2]) * 100, 1),
+        "over_2_5_rate": round(float(averages[3]) * 100, 1),
+        "over_3_5_rate": round(float(averages[4]) * 100, 1),
+    }
@@ -0,0 +1,113 @@
+"""Materialized per-season summaries.
+
+Totals for the open season are accumulated as matches are ingested. When the
+season ends (automatic 38-match reset or manual reset) they are frozen together
+with the final standings, so cross-season views never rescan match history.
+"""
+import numpy as np
+
+TOTAL_FIELDS = ("matches", "goals", "home_wins", "draws", "away_wins", "bts", "over_2_5", "over_3_5")
+
+
+def _new_totals():
+    return dict.fromkeys(TOTAL_FIELDS, 0)
+
+
+def new_season_summaries():
+    """Empty store: running totals for the open season plus finalized seasons"""
+    return {"current": _new_totals(), "seasons": {}}
+
+
+def _add_scores(totals, home_score, away_score):
+    """Add stored match score columns to a season's running totals"""
+    goals = home_score + away_score
+    totals["matches"] += len(goals)
+    totals["goals"] += int(goals.sum())
+    totals["home_wins"] += int(np.count_nonzero(home_score > away_score))
+    totals["away_wins"] += int(np.count_nonzero(away_score > home_score))
+    totals["draws"] += int(np.count_nonzero(home_score == away_score))
+    totals["bts"] += int(np.count_nonzero((home_score > 0) & (away_score > 0)))
+    totals["over_2_5"] += int(np.count_nonzero(goals > 2.5))
+    totals["over_3_5"] += int(np.count_nonzero(goals > 3.5))
+
+
+def finalize_season(summaries, season_number, team_stats):
+    """Freeze the open season's totals and final standings"""
+    totals = summaries["current"]
+    summaries["current"] = _new_totals()
+    if totals["matches"] == 0:
+        return
+
+    rankings = sorted(
+        team_stats.items(),
+        key=lambda x: (x[1]["Pts"], x[1]["GD"], x[1]["GF"]),
+        reverse=True
+    )
+    summaries["seasons"][season_number] = {
+        **totals,
+        "standings": [
+            (pos, team, stats["P"], stats["W"], stats["D"], stats["L"],
+             stats["GF"], stats["GA"], stats["GD"], stats["Pts"])
+            for pos, (team, stats) in enumerate(rankings, 1)
+        ],
+    }
+
+
+def record_batch(summaries, batch, resets):
+    """Accumulate newly ingested matches and finalize the seasons the batch closed.
+
+    `batch` and `resets` are the output of `apply_matches_batch`; only the
+    batch's score and season columns are read.
+    """
+    home_score = batch.columns["home_score"].astype(np.int64)
+    away_score = batch.columns["away_score"].astype(np.int64)
+    # Seasons never decrease within a batch, so each season is one run of matches
+    ends = np.searchsorted(batch.columns["season"], [season for season, _, _ in resets], side="right").tolist()
+    start = 0
+    for (season_number, _, table), end in zip(resets, ends):
+        end = max(start, end)
+        _add_scores(summaries["current"], home_score[start:end], away_score[start:end])
+        finalize_season(summaries, season_number, table)
+        start = end
+    _add_scores(summaries["current"], home_score[start:], away_score[start:])
+
+
+def season_rates(totals):
+    """Averages and percentages for a season's totals"""
+    matches = totals["matches"]
+
+    def pct(count):
+        return round(count / matches * 100, 1) if matches > 0 else 0
+
+    return {
+        "avg_goals": round(totals["goals"] / matches, 2) if matches > 0 else 0,
+        "home_win_pct": pct(totals["home_wins"]),
+        "draw_pct": pct(totals["draws"]),
+        "away_win_pct": pct(totals["away_wins"]),
+        "bts_pct": pct(totals["bts"]),
+        "over_2_5_pct": pct(totals["over_2_5"]),
+        "over_3_5_pct": pct(totals["over_3_5"]),
+    }
+
+
+def compare_seasons(summaries):
+    """One comparison row per finalized season, read only from the summaries"""
+    comparison = []
+    for season_number in sorted(summaries["seasons"]):
+        summary = summaries["seasons"][season_number]
+        rates = season_rates(summary)
+        champion = summary["standings"][0]
+        comparison.append({
+            "Season": season_number,
+            "Matches": summary["matches"],
+            "Champion": champion[1],
+            "Champion Pts": champion[9],
+            "Avg Goals": rates["avg_goals"],
+            "Home %": rates["home_win_pct"],
+            "Draw %": rates["draw_pct"],
+            "Away %": rates["away_win_pct"],
+            "BTS %": rates["bts_pct"],
+            "Over 2.5 %": rates["over_2_5_pct"],
+            "Over 3.5 %": rates["over_3_5_pct"],
+        })
+    return comparison
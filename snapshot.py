@@ -0,0 +1,204 @@
+"""Compact binary snapshots of the full dashboard state.
+
+A snapshot is one NumPy .npz file holding match history as compact typed
+columns (see match_store.STORED_COLUMNS) plus every aggregate: team_stats, the
+four counter dicts, match_counter, season_number, the ranking timeline,
+rolling metrics, season summaries and Elo ratings. Restoring reads the arrays
+straight back; nothing is replayed and match rows are only rebuilt from their
+columns when the dashboard first reads them.
+
+Command line:
+    python snapshot.py info state.npz
+    python snapshot.py csv state.npz matches.csv
+"""
+import argparse
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from match_store import MATCH_COLUMNS, STORED_COLUMNS, ColumnarMatchData, match_columns
+from season_summaries import TOTAL_FIELDS
+
+SNAPSHOT_VERSION = 1
+
+TABLE_FIELDS = ("P", "W", "D", "L", "GF", "GA", "Pts")
+COUNTER_NAMES = ("home", "away", "ha", "status3")
+ROLLING_ARRAYS = ("buffer", "count", "window_sums", "decayed", "decay_weight")
+STANDING_FIELDS = ("P", "W", "D", "L", "GF", "GA", "GD", "Pts")
+
+
+def save_snapshot(state, file):
+    """Write the dashboard state (st.session_state or a plain dict) to `file`"""
+    teams = list(state["team_stats"])
+    index = {team: i for i, team in enumerate(teams)}
+    arrays = {
+        "version": np.array(SNAPSHOT_VERSION),
+        "teams": np.array(teams),
+        "match_counter": np.array(state["match_counter"]),
+        "season_number": np.array(state["season_number"]),
+    }
+    for name, values in match_columns(state["match_data"], teams).items():
+        arrays[f"match/{name}"] = values
+
+    team_stats = state["team_stats"]
+    for field in TABLE_FIELDS:
+        arrays[f"table/{field}"] = np.array([team_stats[team][field] for team in teams], dtype=np.int32)
+    arrays["table/Form"] = np.array(["".join(team_stats[team]["Form"]) for team in teams])
+    for name in COUNTER_NAMES:
+        counters = state[f"{name}_counters"]
+        arrays[f"counters/{name}"] = np.array([counters[team] for team in teams], dtype=np.int32)
+
+    if "ranking_history" in state:
+        history = state["ranking_history"]
+        seasons = sorted(history["seasons"])
+        arrays["ranking/teams"] = np.array(history["teams"])
+        arrays["ranking/seasons"] = np.array(seasons, dtype=np.int32)
+        arrays["ranking/lengths"] = np.array([len(history["seasons"][s]) for s in seasons], dtype=np.int32)
+        arrays["ranking/positions"] = (
+            np.concatenate([history["seasons"][s] for s in seasons]) if seasons
+            else np.zeros((0, len(history["teams"])), dtype=np.int8)
+        )
+
+    if "rolling_metrics" in state:
+        rolling = state["rolling_metrics"]
+        arrays["rolling/teams"] = np.array(rolling["teams"])
+        for name in ROLLING_ARRAYS:
+            arrays[f"rolling/{name}"] = rolling[name]
+
+    if "season_summaries" in state:
+        summaries = state["season_summaries"]
+        seasons = sorted(summaries["seasons"])
+        arrays["summary/current"] = np.array([summaries["current"][f] for f in TOTAL_FIELDS], dtype=np.int64)
+        arrays["summary/seasons"] = np.array(seasons, dtype=np.int32)
+        arrays["summary/totals"] = np.array(
+            [[summaries["seasons"][s][f] for f in TOTAL_FIELDS] for s in seasons], dtype=np.int64
+        ).reshape(len(seasons), len(TOTAL_FIELDS))
+        # Standings rows in table order: team index followed by STANDING_FIELDS
+        arrays["summary/standings"] = np.array(
+            [[[index[row[1]], *row[2:]] for row in summaries["seasons"][s]["standings"]] for s in seasons],
+            dtype=np.int32
+        ).reshape(len(seasons), len(teams), 1 + len(STANDING_FIELDS))
+
+    if "elo" in state:
+        arrays["elo/teams"] = np.array(state["elo"]["teams"])
+        arrays["elo/ratings"] = state["elo"]["ratings"]
+        arrays["elo/matches"] = np.array(state["elo"]["matches"])
+
+    np.savez(file, **arrays)
+
+
+def load_snapshot(file):
+    """Read a snapshot written by `save_snapshot` into a dict of state values.
+
+    A truncated or damaged file (e.g. one still being copied into place)
+    raises ValueError like any other unreadable snapshot.
+    """
+    try:
+        return _read_snapshot(file)
+    except (zipfile.BadZipFile, EOFError) as e:
+        raise ValueError(f"Damaged or incomplete snapshot: {e}") from e
+
+
+def _read_snapshot(file):
+    data = np.load(file, allow_pickle=False)
+    if not isinstance(data, np.lib.npyio.NpzFile):
+        # A bare .npy (e.g. one saved array renamed to .npz) loads as an ndarray
+        raise ValueError("Not a snapshot archive: expected a .npz file")
+    with data:
+        version = int(data["version"])
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION})")
+        files = set(data.files)
+        teams = data["teams"].tolist()
+
+        state = {
+            "match_data": ColumnarMatchData({name: data[f"match/{name}"] for name in STORED_COLUMNS}, teams),
+            "match_counter": int(data["match_counter"]),
+            "season_number": int(data["season_number"]),
+        }
+        table = {field: data[f"table/{field}"].tolist() for field in TABLE_FIELDS}
+        forms = data["table/Form"].tolist()
+        state["team_stats"] = {
+            team: {
+                "P": table["P"][i], "W": table["W"][i], "D": table["D"][i], "L": table["L"][i],
+                "GF": table["GF"][i], "GA": table["GA"][i], "GD": table["GF"][i] - table["GA"][i],
+                "Pts": table["Pts"][i], "Form": list(forms[i])
+            }
+            for i, team in enumerate(teams)
+        }
+        for name in COUNTER_NAMES:
+            state[f"{name}_counters"] = dict(zip(teams, data[f"counters/{name}"].tolist()))
+
+        if "ranking/teams" in files:
+            positions = data["ranking/positions"]
+            bounds = np.cumsum(data["ranking/lengths"])
+            state["ranking_history"] = {
+                "teams": data["ranking/teams"].tolist(),
+                "seasons": dict(zip(data["ranking/seasons"].tolist(), np.split(positions, bounds[:-1]))),
+            }
+
+        if "rolling/teams" in files:
+            rolling_teams = data["rolling/teams"].tolist()
+            state["rolling_metrics"] = {
+                "teams": rolling_teams,
+                "index": {team: i for i, team in enumerate(rolling_teams)},
+                **{name: data[f"rolling/{name}"] for name in ROLLING_ARRAYS},
+            }
+
+        if "summary/current" in files:
+            standings = data["summary/standings"].tolist()
+            seasons = {}
+            for i, (season, totals) in enumerate(zip(data["summary/seasons"].tolist(), data["summary/totals"].tolist())):
+                seasons[season] = {
+                    **dict(zip(TOTAL_FIELDS, totals)),
+                    "standings": [(pos, teams[row[0]], *row[1:]) for pos, row in enumerate(standings[i], 1)],
+                }
+            state["season_summaries"] = {
+                "current": dict(zip(TOTAL_FIELDS, data["summary/current"].tolist())),
+                "seasons": seasons,
+            }
+
+        if "elo/teams" in files:
+            elo_teams = data["elo/teams"].tolist()
+            state["elo"] = {
+                "teams": elo_teams,
+                "index": {team: i for i, team in enumerate(elo_teams)},
+                "ratings": data["elo/ratings"],
+                "matches": int(data["elo/matches"]),
+            }
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or export dashboard snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+    info = commands.add_parser("info", help="Summarize a snapshot")
+    info.add_argument("snapshot")
+    export = commands.add_parser("csv", help="Export all match rows to CSV")
+    export.add_argument("snapshot")
+    export.add_argument("output")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    state = load_snapshot(args.snapshot)
+    load_time = time.perf_counter() - start
+
+    if args.command == "info":
+        rankings = sorted(
+            state["team_stats"].items(),
+            key=lambda x: (x[1]["Pts"], x[1]["GD"], x[1]["GF"]),
+            reverse=True
+        )
+        print(f"Snapshot v{SNAPSHOT_VERSION}: {len(state['match_data']):,} matches, "
+              f"season {state['season_number']} (next match {state['match_counter']}), loaded in {load_time * 1000:.1f}ms")
+        for pos, (team, stats) in enumerate(rankings[:5], 1):
+            print(f"  {pos:>2}. {team:<16} P{stats['P']:>3}  GD{stats['GD']:>+4}  {stats['Pts']:>3} pts")
+    else:
+        pd.DataFrame(state["match_data"].rows(), columns=MATCH_COLUMNS).to_csv(args.output, index=False)
+        print(f"Wrote {len(state['match_data']):,} matches to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Fuzzy team-name resolution for pasted and scraped match feeds.
+
+The index is built once: every canonical name and alias is normalized into an
+exact lookup table, and a trigram inverted index maps each trigram to the alias
+keys containing it. Resolving a line tries exact word windows first, then
+bounded edit distance against only the aliases that share enough trigrams with
+the query. Results are cached per raw string.
+"""
+import re
+from collections import Counter
+
+# Canonical name -> extra spellings seen in feeds (canonical names are always indexed)
+TEAM_ALIASES = {
+    "Leeds": ["Leeds United", "Leeds Utd", "LUFC"],
+    "Aston V": ["Aston Villa", "Aston", "Villa", "AVFC"],
+    "Manchester Blue": ["Man Blue", "Manchester Blues", "Man Blues", "Man City", "Manchester City", "MCFC"],
+    "Liverpool": ["Liverpool FC", "LFC"],
+    "London Blues": ["Chelsea"],
+    "Everton": ["Everton FC"],
+    "Brighton": ["Brighton and Hove Albion", "Brighton Hove", "BHAFC"],
+    "Sheffield U": ["Sheffield United", "Sheffield Utd", "Sheff Utd", "Sheff U", "SUFC"],
+    "Tottenham": ["Tottenham Hotspur", "Spurs", "THFC"],
+    "Palace": ["Crystal Palace", "C Palace", "CPFC"],
+    "Newcastle": ["Newcastle United", "Newcastle Utd", "NUFC"],
+    "West Ham": ["West Ham United", "West Ham Utd", "WHU"],
+    "Leicester": ["Leicester City", "LCFC"],
+    "West Brom": ["West Bromwich Albion", "West Bromwich", "WBA"],
+    "Burnley": ["Burnley FC"],
+    "London Reds": ["Arsenal"],
+    "Southampton": ["Saints", "Southampton FC"],
+    "Wolves": ["Wolverhampton", "Wolverhampton Wanderers", "WWFC"],
+    "Fulham": ["Fulham FC"],
+    "Manchester Reds": ["Man Reds", "Manchester Red", "Man Red", "Man Utd", "Manchester Utd", "Manchester United", "MUFC"],
+}
+
+MAX_WINDOW_WORDS = 4  # longest alias, in words
+MAX_LINE_WORDS = 8  # longer lines only get exact window matching
+CACHE_SIZE = 10_000
+_MISSING = object()  # cache sentinel; None is a valid cached result
+
+
+def normalize_name(text):
+    """Lowercase, '&' -> 'and', punctuation to spaces, single-spaced"""
+    text = text.lower().replace("&", " and ")
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text).split())
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edits(key):
+    """Edit-distance budget for a normalized query: none for short strings"""
+    if len(key) < 4:
+        return 0
+    return 1 if len(key) < 8 else 2
+
+
+def build_team_index(teams, aliases=TEAM_ALIASES):
+    """Exact alias table plus trigram index for `teams`"""
+    exact = {}
+    for team in teams:
+        for name in [team, *aliases.get(team, [])]:
+            key = normalize_name(name)
+            if exact.setdefault(key, team) != team:
+                raise ValueError(f"Alias '{name}' is used for both {exact[key]} and {team}")
+
+    keys = list(exact)
+    grams = {}
+    for i, key in enumerate(keys):
+        for gram in _trigrams(key):
+            grams.setdefault(gram, []).append(i)
+    return {"exact": exact, "keys": keys, "grams": grams, "cache": {}}
+
+
+def bounded_edit_distance(a, b, limit):
+    """Levenshtein distance between a and b, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _plausible_typo(key, alias):
+    """False when the alias only differs by a whole word the query lacks
+    ("sheffield" vs "sheffield u") or by a short word swapped for another
+    ("sheffield wed" vs "sheffield utd"): those name a different team.
+    """
+    words, alias_words = key.split(), alias.split()
+    if len(words) < len(alias_words) and set(words) <= set(alias_words):
+        return False
+    if len(words) == len(alias_words):
+        return all(
+            bounded_edit_distance(a, b, 1) <= 1
+            for a, b in zip(words, alias_words) if min(len(a), len(b)) < 4
+        )
+    return True
+
+
+def _fuzzy_match(index, key):
+    """(distance, team) for the closest alias within max_edits(key), else None"""
+    limit = max_edits(key)
+    if limit == 0:
+        return None
+    # Each edit touches at most 3 trigrams, so a match must share the rest
+    query = _trigrams(key)
+    shared = Counter(i for gram in query for i in index["grams"].get(gram, ()))
+    needed = max(1, len(query) - 3 * limit)
+
+    best, best_teams = limit + 1, set()
+    for i, count in shared.items():
+        if count < needed or not _plausible_typo(key, index["keys"][i]):
+            continue
+        distance = bounded_edit_distance(key, index["keys"][i], limit)
+        team = index["exact"][index["keys"][i]]
+        if distance < best:
+            best, best_teams = distance, {team}
+        elif distance == best:
+            best_teams.add(team)
+    # Equally close to two different teams is ambiguous
+    if best <= limit and len(best_teams) == 1:
+        return best, best_teams.pop()
+    return None
+
+
+def _windows(words):
+    """Contiguous word windows, longest first"""
+    for size in range(min(len(words), MAX_WINDOW_WORDS), 0, -1):
+        for start in range(len(words) - size + 1):
+            yield " ".join(words[start:start + size])
+
+
+def _resolve(index, text):
+    key = normalize_name(text)
+    if not key:
+        return None
+    exact = index["exact"]
+    if key in exact:
+        return exact[key]
+
+    words = key.split()
+    windows = list(_windows(words))
+    for window in windows:
+        if window in exact:
+            return exact[window]
+
+    if len(words) > MAX_LINE_WORDS:
+        return None
+    matches = [match for match in (_fuzzy_match(index, window) for window in windows) if match]
+    if not matches:
+        return None
+    best = min(distance for distance, _ in matches)
+    teams = {team for distance, team in matches if distance == best}
+    return teams.pop() if len(teams) == 1 else None
+
+
+def resolve_team(index, text):
+    """Canonical team name for a raw line, or None if it names no team"""
+    # The index is shared across sessions and another one may clear the cache
+    # between the lookup and the store, so only the local result is returned
+    cache = index["cache"]
+    team = cache.get(text, _MISSING)
+    if team is _MISSING:
+        team = _resolve(index, text)
+        if len(cache) >= CACHE_SIZE:
+            cache.clear()
+        cache[text] = team
+    return team
@@ -0,0 +1,78 @@
+import pytest
+
+from ingest import apply_matches_batch, new_team_stats
+from match_stats import compute_team_metrics, head_to_head_stats
+from match_store import ColumnarMatchData, match_columns
+
+TEAMS = ["Leeds", "Wolves", "Fulham", "Burnley"]
+MATCHES = [
+    ["Leeds", 2, 1, "Wolves"],
+    ["Wolves", 0, 0, "Fulham"],
+    ["Fulham", 3, 2, "Leeds"],
+    ["Wolves", 2, 2, "Leeds"],
+    ["Leeds", 1, 0, "Fulham"],
+    ["Leeds", 0, 3, "Wolves"],
+]
+
+# Numbers produced by the original row-by-row calculate_team_metrics / create_head_to_head_stats
+EXPECTED_METRICS = {
+    "Leeds": {"win_rate": 40.0, "draw_rate": 20.0, "loss_rate": 40.0, "avg_gf": 1.4, "avg_ga": 1.8,
+              "bts_rate": 60.0, "form": ["W", "L", "D", "W", "L"], "points_per_game": 1.4},
+    "Wolves": {"win_rate": 25.0, "draw_rate": 50.0, "loss_rate": 25.0, "avg_gf": 1.5, "avg_ga": 1.0,
+               "bts_rate": 50.0, "form": ["L", "D", "D", "W"], "points_per_game": 1.25},
+    "Fulham": {"win_rate": 33.3, "draw_rate": 33.3, "loss_rate": 33.3, "avg_gf": 1.0, "avg_ga": 1.0,
+               "bts_rate": 33.3, "form": ["D", "W", "L"], "points_per_game": 1.33},
+    "Burnley": {"win_rate": 0, "draw_rate": 0, "loss_rate": 0, "avg_gf": 0, "avg_ga": 0,
+                "bts_rate": 0, "form": [], "points_per_game": 0},
+}
+LEEDS_WOLVES = {
+    "total_matches": 3, "home_wins": 1, "away_wins": 1, "draws": 1, "avg_goals": 3.33,
+    "over_2_5": 3, "over_3_5": 1, "both_teams_score": 2,
+    "over_2_5_pct": 100.0, "over_3_5_pct": 33.3, "both_teams_score_pct": 66.7,
+}
+FULHAM_LEEDS = {
+    "total_matches": 2, "home_wins": 1, "away_wins": 1, "draws": 0, "avg_goals": 3.0,
+    "over_2_5": 1, "over_3_5": 1, "both_teams_score": 1,
+    "over_2_5_pct": 50.0, "over_3_5_pct": 50.0, "both_teams_score_pct": 50.0,
+}
+
+
+@pytest.fixture
+def history():
+    state = {
+        "team_stats": new_team_stats(TEAMS),
+        "home_counters": dict.fromkeys(TEAMS, 0),
+        "away_counters": dict.fromkeys(TEAMS, 0),
+        "ha_counters": dict.fromkeys(TEAMS, 0),
+        "status3_counters": dict.fromkeys(TEAMS, 0),
+        "match_counter": 1,
+        "season_number": 1,
+    }
+    match_data, _ = apply_matches_batch(MATCHES, state)
+    return state["team_stats"], match_data
+
+
+def test_team_metrics(history):
+    team_stats, match_data = history
+    assert compute_team_metrics(team_stats, match_columns(match_data, TEAMS), TEAMS) == EXPECTED_METRICS
+
+
+@pytest.mark.parametrize("home, away, expected", [
+    ("Leeds", "Wolves", LEEDS_WOLVES),
+    ("Wolves", "Leeds", LEEDS_WOLVES),
+    ("Fulham", "Leeds", FULHAM_LEEDS),
+    ("Leeds", "Burnley", None),
+])
+def test_head_to_head(history, home, away, expected):
+    _, match_data = history
+    assert head_to_head_stats(match_columns(match_data, TEAMS), TEAMS, home, away) == expected
+
+
+def test_other_team_order_builds_no_rows(history):
+    team_stats, match_data = history
+    # A snapshot restored with its own team order is remapped, never expanded to rows
+    restored = ColumnarMatchData(match_columns(match_data, TEAMS[::-1]), TEAMS[::-1])
+    columns = match_columns(restored, TEAMS)
+    assert compute_team_metrics(team_stats, columns, TEAMS) == EXPECTED_METRICS
+    assert head_to_head_stats(columns, TEAMS, "Fulham", "Leeds") == FULHAM_LEEDS
+    assert restored._rows == []
@@ -0,0 +1,58 @@
+import pytest
+
+from team_names import TEAM_ALIASES, build_team_index, resolve_team
+
+
+@pytest.fixture
+def index():
+    return build_team_index(sorted(TEAM_ALIASES))
+
+
+@pytest.mark.parametrize("line, team", [
+    ("Aston Villa", "Aston V"),
+    ("Man Blue", "Manchester Blue"),
+    ("Man City", "Manchester Blue"),
+    ("Sheff Utd", "Sheffield U"),
+    ("Sheffield United", "Sheffield U"),
+    ("Manchester Utd", "Manchester Reds"),
+    ("Leeds", "Leeds"),
+    ("  leeds utd. ", "Leeds"),
+    ("Brighton & Hove Albion", "Brighton"),
+    ("Mancehster City", "Manchester Blue"),
+    ("Aston Vila", "Aston V"),
+    ("Tottenahm", "Tottenham"),
+])
+def test_resolves_aliases_and_typos(index, line, team):
+    assert resolve_team(index, line) == team
+
+
+@pytest.mark.parametrize("line", [
+    "Sheffield",
+    "Sheffield Wed",
+    "Sheffield Wednesday",
+    "Sheff Wed",
+    "Nottingham Forest",
+    "Manchester",
+    "Man",
+    "WEEK 12",
+    "English League",
+    "15:00 pm",
+    "#1234",
+    "2",
+    "",
+])
+def test_rejects_other_teams_and_non_team_lines(index, line):
+    assert resolve_team(index, line) is None
+
+
+def test_cached_result_survives_a_cleared_cache(index):
+    assert resolve_team(index, "Aston Villa") == "Aston V"
+    index["cache"].clear()
+    assert resolve_team(index, "Aston Villa") == "Aston V"
+    assert resolve_team(index, "Sheffield Wed") is None
+    assert index["cache"] == {"Aston Villa": "Aston V", "Sheffield Wed": None}
+
+
+def test_alias_used_for_two_teams_is_rejected():
+    with pytest.raises(ValueError):
+        build_team_index(["Leeds", "Leicester"], {"Leeds": ["LFC"], "Leicester": ["LFC"]})
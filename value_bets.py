@@ -0,0 +1,138 @@
+"""Value-bet scanner over locally supplied odds snapshots.
+
+Odds files are CSV or JSON with one row per fixture: `home_team`, `away_team`
+and decimal odds for any of the MARKETS columns. Snapshots are stacked oldest
+first so the newest price per fixture and market wins, and expected value and
+Kelly fractions are computed for every fixture x market in one NumPy pass.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FIXTURE_COLUMNS = ("home_team", "away_team")
+
+# Odds column -> display name; model_probabilities builds columns in this order
+MARKETS = {
+    "home": "Home Win",
+    "draw": "Draw",
+    "away": "Away Win",
+    "home_or_draw": "Home or Draw",
+    "home_or_away": "Home or Away",
+    "draw_or_away": "Draw or Away",
+    "over_2_5": "Over 2.5",
+    "under_2_5": "Under 2.5",
+    "over_3_5": "Over 3.5",
+    "under_3_5": "Under 3.5",
+    "over_4_5": "Over 4.5",
+    "under_4_5": "Under 4.5",
+    "bts_yes": "BTS Yes",
+    "bts_no": "BTS No",
+}
+
+
+def read_odds_file(source, name=None, resolve=None):
+    """Parse one CSV or JSON odds snapshot (path or file-like object).
+
+    `resolve` maps a raw team name to its canonical name (or None); names it
+    cannot resolve are kept as written.
+    """
+    name = str(name or source).lower()
+    if name.endswith(".json"):
+        odds = pd.read_json(source)
+    elif name.endswith(".csv"):
+        odds = pd.read_csv(source)
+    else:
+        raise ValueError(f"Unsupported odds file: {name} (expected .csv or .json)")
+
+    missing = [column for column in FIXTURE_COLUMNS if column not in odds.columns]
+    if missing:
+        raise ValueError(f"Odds file {name} is missing columns: {', '.join(missing)}")
+    if resolve is not None:
+        for column in FIXTURE_COLUMNS:
+            names = odds[column].astype(str)
+            odds[column] = names.map({raw: resolve(raw) or raw for raw in names.unique()})
+    for market in MARKETS:
+        if market not in odds.columns:
+            odds[market] = np.nan
+    odds[list(MARKETS)] = odds[list(MARKETS)].apply(pd.to_numeric, errors="coerce")
+    return odds[list(FIXTURE_COLUMNS) + list(MARKETS)]
+
+
+def combine_snapshots(snapshots):
+    """Latest non-empty price per fixture and market, snapshots given oldest first"""
+    if not snapshots:
+        return pd.DataFrame(columns=list(FIXTURE_COLUMNS) + list(MARKETS))
+    odds = pd.concat(snapshots, ignore_index=True)
+    return odds.groupby(list(FIXTURE_COLUMNS), sort=False).last().reset_index()
+
+
+def load_odds_folder(folder, cache, resolve=None):
+    """Combine every readable odds file in `folder`, oldest first.
+
+    `cache` maps path -> (mtime, parsed snapshot or None, error) so only new or
+    changed files are parsed when more snapshots land. Returns (odds, skipped)
+    where skipped lists (file name, error) for files that could not be read.
+    `resolve` is passed on to read_odds_file.
+    """
+    folder = Path(folder)
+    if not folder.is_dir():
+        return combine_snapshots([]), []
+    paths = sorted(
+        (path for path in folder.iterdir() if path.suffix.lower() in (".csv", ".json")),
+        key=lambda path: path.stat().st_mtime_ns
+    )
+    snapshots, skipped = [], []
+    for path in paths:
+        stamp = path.stat().st_mtime_ns
+        cached = cache.get(str(path))
+        if cached is None or cached[0] != stamp:
+            try:
+                cached = (stamp, read_odds_file(path, resolve=resolve), None)
+            except (ValueError, OSError) as error:
+                cached = (stamp, None, str(error))
+            cache[str(path)] = cached
+        if cached[1] is None:
+            skipped.append((path.name, cached[2]))
+        else:
+            snapshots.append(cached[1])
+    return combine_snapshots(snapshots), skipped
+
+
+def model_probabilities(predictions):
+    """(fixtures x MARKETS) probabilities from predict_match_outcome results"""
+    def column(key):
+        return np.array([prediction[key] for prediction in predictions], dtype=np.float64) / 100
+
+    home, draw, away = column("home_win"), column("draw"), column("away_win")
+    over_2_5, over_3_5, over_4_5 = column("over_2_5"), column("over_3_5"), column("over_4_5")
+    bts = column("both_teams_score")
+    probabilities = np.column_stack([
+        home, draw, away,
+        home + draw, home + away, draw + away,
+        over_2_5, 1 - over_2_5, over_3_5, 1 - over_3_5, over_4_5, 1 - over_4_5,
+        bts, 1 - bts,
+    ])
+    return np.clip(probabilities, 0, 1)
+
+
+def value_bet_board(odds, probabilities, min_edge=0.0):
+    """Every fixture x market with expected value above `min_edge`, best first"""
+    prices = odds[list(MARKETS)].to_numpy(dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        expected_value = probabilities * prices - 1
+        kelly = np.where(prices > 1, expected_value / (prices - 1), np.nan)
+    fixture_idx, market_idx = np.nonzero(np.isfinite(expected_value) & (expected_value > min_edge))
+
+    market_names = np.array(list(MARKETS.values()), dtype=object)
+    board = pd.DataFrame({
+        "Fixture": (odds["home_team"].to_numpy(dtype=object)[fixture_idx] + " vs "
+                    + odds["away_team"].to_numpy(dtype=object)[fixture_idx]),
+        "Market": market_names[market_idx],
+        "Odds": prices[fixture_idx, market_idx],
+        "Model %": np.round(probabilities[fixture_idx, market_idx] * 100, 1),
+        "Implied %": np.round(100 / prices[fixture_idx, market_idx], 1),
+        "EV %": np.round(expected_value[fixture_idx, market_idx] * 100, 1),
+        "Kelly %": np.round(np.clip(kelly[fixture_idx, market_idx], 0, 1) * 100, 1),
+    })
+    return board.sort_values("EV %", ascending=False, kind="stable").reset_index(drop=True)
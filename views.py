@@ -0,0 +1,63 @@
+"""View models for the league table and the recent-match feed.
+
+Both are built in one pass from stored state and handed to Streamlit as a
+single component each: the table as one DataFrame, the feed as one HTML block
+holding a page of matches in a scrollable container.
+"""
+import numpy as np
+import pandas as pd
+
+LEAGUE_COLUMNS = ["Pos", "Team", "P", "W", "D", "L", "GF", "GA", "GD", "Pts", "Form", "Elo"]
+TABLE_FIELDS = ["P", "W", "D", "L", "GF", "GA", "GD", "Pts"]
+FEED_PAGE_SIZES = [10, 25, 50, 100, 500]
+
+_WIN_STYLE = "color: #4CAF50; font-weight: bold;"
+_LOSS_STYLE = "color: #FF6B6B;"
+_DRAW_STYLE = "color: #FFD700;"
+_FEED_CONTAINER = (
+    "background-color:black; color:white; padding:15px; border-radius:10px; "
+    "border:2px solid #444; overflow-y:auto; max-height:{height}px;"
+)
+_FEED_ITEM = "font-size:14px; margin-bottom:8px; padding:5px; border-bottom:1px solid #333;"
+
+
+def league_table(team_stats, elo):
+    """League table DataFrame, ranked by Pts, GD, GF (ties keep table order)"""
+    teams = list(team_stats)
+    stats = np.array([[team_stats[team][field] for field in TABLE_FIELDS] for team in teams], dtype=np.int64)
+    pts, gd, gf = stats[:, 7], stats[:, 6], stats[:, 4]
+    order = np.lexsort((-gf, -gd, -pts))
+
+    names = np.array(teams, dtype=object)[order]
+    ratings = np.round(elo["ratings"][[elo["index"][team] for team in names]]).astype(np.int64)
+    table = pd.DataFrame(stats[order], columns=TABLE_FIELDS)
+    table.insert(0, "Pos", np.arange(1, len(teams) + 1))
+    table.insert(1, "Team", names)
+    table["Form"] = [" ".join(team_stats[team]["Form"][-5:]) or "No matches" for team in names]
+    table["Elo"] = ratings
+    return table[LEAGUE_COLUMNS]
+
+
+def feed_page_bounds(total, page_size, page):
+    """[start, end) of page `page` (1 = newest matches) in a history of `total` matches"""
+    end = max(total - (page - 1) * page_size, 0)
+    return max(end - page_size, 0), end
+
+
+def recent_feed_html(rows, height=520):
+    """One HTML block for stored match rows, newest first"""
+    if not rows:
+        return f"<div style='{_FEED_CONTAINER.format(height=height)}'>No matches yet</div>"
+    home, home_score, away_score, away, home_rank, away_rank = zip(
+        *((row[1], row[2], row[3], row[4], row[11], row[12]) for row in reversed(rows))
+    )
+    home_goals, away_goals = np.array(home_score), np.array(away_score)
+    home_style = np.where(home_goals > away_goals, _WIN_STYLE, np.where(home_goals < away_goals, _LOSS_STYLE, _DRAW_STYLE))
+    away_style = np.where(away_goals > home_goals, _WIN_STYLE, np.where(away_goals < home_goals, _LOSS_STYLE, _DRAW_STYLE))
+    items = "".join(
+        f"<div style='{_FEED_ITEM}'><span style='{hs}'>{hr}. {h}</span> {hg}-{ag} <span style='{as_}'>{a} ({ar}.)</span></div>"
+        for h, hg, ag, a, hr, ar, hs, as_ in zip(
+            home, home_score, away_score, away, home_rank, away_rank, home_style, away_style
+        )
+    )
+    return f"<div style='{_FEED_CONTAINER.format(height=height)}'>{items}</div>"